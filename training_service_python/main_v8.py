@@ -1,46 +1,230 @@
 import asyncio
+import codecs
+import glob
 import os
+import re
 import uuid
 import time
-import base64
-import io
-import cv2
-import pty
-import select
+import importlib.util
 import psutil
 import random
 import shutil
-from PIL import Image
-import numpy as np
-from fastapi import FastAPI, BackgroundTasks, HTTPException, WebSocket, File, UploadFile, Form
-from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+import struct
+from fastapi import FastAPI, HTTPException, WebSocket, File, UploadFile, Form, Header
+from fastapi.responses import JSONResponse, FileResponse, Response
 from pydantic import BaseModel
-import subprocess
 import datetime
-import json
+import orjson
+import aiofiles
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
 
-# Optional import - YOLO might not be available during development
-try:
+# Optional dependency - YOLO might not be available during development.
+# Heavy imaging packages (ultralytics/torch, cv2, PIL, numpy) are imported lazily
+# inside the handlers that use them to keep worker startup fast and RSS low.
+YOLO_AVAILABLE = importlib.util.find_spec("ultralytics") is not None
+
+# Models are served through an ONNX Runtime export when onnxruntime is installed
+ONNX_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+
+# TensorRT engines are built for GPU inference when tensorrt is installed
+TENSORRT_AVAILABLE = importlib.util.find_spec("tensorrt") is not None
+
+@lru_cache(maxsize=None)
+def get_inference_device() -> str:
+    """Run inference on the first CUDA GPU when torch can see one, otherwise on the CPU"""
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda:0" if torch.cuda.is_available() else "cpu"
+
+def get_model_imgsz(model) -> int:
+    """
+    Square input size for a loaded .pt model: the longest side of the imgsz it was trained
+    at (train_yolov8.py trains rectangular sizes up to 1280x720), rounded up to the stride
+    """
+    imgsz = model.overrides.get("imgsz") or 640  # ultralytics' own default
+    if isinstance(imgsz, (list, tuple)):
+        imgsz = max(imgsz)
+    stride = 32
+    return -(-int(imgsz) // stride) * stride
+
+def is_export_current(export_path: Path, model_path: Path) -> bool:
+    """Check that an exported model exists and is newer than the .pt weights it came from"""
+    try:
+        return export_path.stat().st_mtime >= model_path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+def export_path(model_path: Path, imgsz: int, suffix: str) -> Path:
+    """
+    Path of an export of model_path. The settings it is built with (input size, dynamic
+    batch axis) are part of the name, so an export made with other settings, such as an
+    older static-batch graph, is never picked up as current.
+    """
+    return model_path.with_name(f"{model_path.stem}.{imgsz}-dynamic{suffix}")
+
+def int8_model_path(model_path: Path, imgsz: int) -> Path:
+    """Path of the INT8 quantized ONNX model created by /api/model/quantize"""
+    return export_path(model_path, imgsz, "_int8.onnx")
+
+def export_onnx_model(model, model_path: Path, imgsz: int) -> Path:
+    """Export a YOLO model to ONNX next to its weights, reusing an export newer than the .pt file"""
+    onnx_path = export_path(model_path, imgsz, ".onnx")
+    if is_export_current(onnx_path, model_path):
+        return onnx_path
+    
+    # half=True gives an FP16 graph when exporting on a GPU; ultralytics keeps FP32 on CPU.
+    # A dynamic batch axis lets the inference worker run several queued images at once.
+    return Path(model.export(
+        format="onnx", imgsz=imgsz, half=True, dynamic=True, device=get_inference_device()
+    )).replace(onnx_path)
+
+def export_fp32_onnx_model(model, model_path: Path, imgsz: int) -> Path:
+    """
+    Export an FP32 ONNX graph on the CPU as the source for INT8 quantization; the inference
+    export is FP16 on GPU hosts, which the float32 calibration inputs can't be fed to
+    """
+    fp32_path = export_path(model_path, imgsz, "_fp32.onnx")
+    if is_export_current(fp32_path, model_path):
+        return fp32_path
+    
+    return Path(model.export(
+        format="onnx", imgsz=imgsz, half=False, dynamic=True, device="cpu"
+    )).replace(fp32_path)
+
+def export_engine_model(model, model_path: Path, imgsz: int) -> Path:
+    """Build an FP16 TensorRT engine next to the weights, reusing one newer than the .pt file"""
+    engine_path = export_path(model_path, imgsz, ".engine")
+    if is_export_current(engine_path, model_path):
+        return engine_path
+    
+    return Path(model.export(
+        format="engine", imgsz=imgsz, half=True, dynamic=True,
+        batch=INFERENCE_BATCH_SIZE, device=get_inference_device()
+    )).replace(engine_path)
+
+# Dummy inferences run right after loading; the first builds the ORT/TensorRT graph and
+# cuDNN plans, the second settles the allocators so the first real request is not slow
+MODEL_WARMUP_RUNS = 2
+
+def warmup_model(model, imgsz: int):
+    """Run blank batches through a freshly loaded model the same way predict_batch does"""
+    import torch
+    
+    device = get_inference_device()
+    dummy = torch.zeros((1, 3, imgsz, imgsz))
+    try:
+        for _ in range(MODEL_WARMUP_RUNS):
+            model(dummy, conf=0.5, device=device, half=device != "cpu", verbose=False)
+    except Exception as e:
+        print(f"Model warmup failed: {e}")
+
+def load_yolo_model(model_path):
+    """
+    Load a YOLO model through the fastest available backend and warm it up.
+    
+    Returns:
+        tuple: (model, imgsz) where imgsz is the square size to letterbox inputs to
+    """
+    model, imgsz = open_yolo_model(model_path)
+    warmup_model(model, imgsz)
+    return model, imgsz
+
+def open_yolo_model(model_path):
+    """
+    Import ultralytics on first use and load a YOLO model, through TensorRT on a GPU
+    or ONNX Runtime when available. Returns (model, imgsz) like load_yolo_model.
+    """
     from ultralytics import YOLO
-    YOLO_AVAILABLE = True
-except ImportError:
-    YOLO_AVAILABLE = False
-    YOLO = None
+    model_path = Path(model_path)
+    on_gpu = get_inference_device() != "cpu"
+    
+    # The .pt checkpoint knows the size it was trained at; exports are built at that size
+    model = YOLO(model_path)
+    imgsz = get_model_imgsz(model)
+    
+    # On CPU prefer the INT8 quantized model when one has been created for these weights
+    int8_path = int8_model_path(model_path, imgsz)
+    if not on_gpu and ONNX_AVAILABLE and is_export_current(int8_path, model_path):
+        print(f"Using INT8 ONNX Runtime model: {int8_path}")
+        return YOLO(str(int8_path), task="detect"), imgsz
+    
+    if on_gpu and TENSORRT_AVAILABLE:
+        try:
+            engine_path = export_engine_model(model, model_path, imgsz)
+            print(f"Using TensorRT engine: {engine_path}")
+            return YOLO(str(engine_path), task="detect"), imgsz
+        except Exception as e:
+            print(f"TensorRT export failed: {e}")
+    
+    if not ONNX_AVAILABLE:
+        return model, imgsz
+    
+    try:
+        onnx_path = export_onnx_model(model, model_path, imgsz)
+        print(f"Using ONNX Runtime model: {onnx_path}")
+        return YOLO(str(onnx_path), task="detect"), imgsz
+    except Exception as e:
+        print(f"ONNX export failed, using PyTorch model: {e}")
+        return model, imgsz
+
+# Worker threads for blocking helpers run through asyncio.to_thread
+DEFAULT_EXECUTOR_WORKERS = 8
+
+# Loading the configured model (ONNX/TensorRT export plus warmup) can take tens of seconds,
+# so it runs in the background after startup; inference endpoints answer 503 until it's done
+startup_model_task = None
+model_ready = False
+
+async def load_startup_model():
+    """Load the model selected in the pipeline config off the event loop"""
+    global model_ready
+    try:
+        await asyncio.to_thread(initialize_model_from_config)
+    finally:
+        model_ready = True
+
+def require_model_ready():
+    """Reject inference requests while the startup model is still loading"""
+    if not model_ready:
+        raise HTTPException(status_code=503, detail="Model is still loading, try again shortly.")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    global startup_model_task
     print("Starting up FastAPI application...")
-    initialize_model_from_config()
+    
+    # Bounded pool for the blocking work handlers push off the event loop with
+    # asyncio.to_thread (file I/O, process scans, config parsing)
+    executor = ThreadPoolExecutor(max_workers=DEFAULT_EXECUTOR_WORKERS, thread_name_prefix="api")
+    asyncio.get_running_loop().set_default_executor(executor)
+    
+    startup_model_task = asyncio.create_task(load_startup_model())
+    inference_task = start_inference_worker()
     yield
     # Shutdown
     print("Shutting down FastAPI application...")
+    startup_model_task.cancel()
+    inference_task.cancel()
+    executor.shutdown(wait=False)
 
 app = FastAPI(lifespan=lifespan)
 
 MODELS_DIR = "models"
 LOGS_DIR = "logs"
+_MODELS_DIR_P = Path(MODELS_DIR)
+
+# Files kept next to each model: the HTML training report, the metrics info file and
+# the untagged .onnx ultralytics leaves behind when building a TensorRT engine
+MODEL_SIDECAR_EXTS = (".html", ".txt", ".onnx")
+
+# Name suffixes of the inference exports written by export_path, after "{stem}."
+MODEL_EXPORT_SUFFIX_RE = r"\.\d+-dynamic(?:\.onnx|_fp32\.onnx|_int8\.onnx|\.engine)"
 os.makedirs(MODELS_DIR, exist_ok=True)
 os.makedirs(LOGS_DIR, exist_ok=True)
 
@@ -50,24 +234,48 @@ tasks = {}
 # Track active processes for cancellation
 active_processes = {}
 
-# Global model instance for testing
+# Global model instance for testing, and the square size its inputs are letterboxed to
 loaded_model = None
 loaded_model_path = None
+loaded_model_imgsz = None
+
+# Pipeline configuration (single source of truth shared with the frontend)
+PIPELINE_CONFIG_FILE = "./frontend/config/training-pipeline.json"
+
+# Parsed pipeline config, reused until the file's mtime changes
+_pipeline_cache = {"mtime": None, "data": None}
+
+def _get_pipeline_config_cached():
+    """
+    Return the parsed pipeline configuration, or None if the file doesn't exist.
+    The file is only re-read and re-parsed when its modification time changes.
+    """
+    try:
+        mtime = os.stat(PIPELINE_CONFIG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    
+    if _pipeline_cache["mtime"] == mtime:
+        return _pipeline_cache["data"]
+    
+    with open(PIPELINE_CONFIG_FILE, 'rb') as f:
+        data = orjson.loads(f.read())
+    
+    _pipeline_cache["mtime"] = mtime
+    _pipeline_cache["data"] = data
+    return data
 
 def load_pipeline_config_sync():
     """Load pipeline configuration to get selected model"""
-    pipeline_config_file = "./frontend/config/training-pipeline.json"
-    if os.path.exists(pipeline_config_file):
-        try:
-            with open(pipeline_config_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading pipeline config: {e}")
+    try:
+        return _get_pipeline_config_cached()
+    except Exception as e:
+        print(f"Error loading pipeline config: {e}")
     return None
 
 def initialize_model_from_config():
     """Initialize model from pipeline configuration on startup"""
-    global loaded_model, loaded_model_path
+    global loaded_model, loaded_model_path, loaded_model_imgsz
     
     pipeline_config = load_pipeline_config_sync()
     if not pipeline_config:
@@ -85,13 +293,13 @@ def initialize_model_from_config():
             
             if selected_model:
                 # Check if the model file exists
-                model_path = os.path.join(MODELS_DIR, selected_model)
+                model_path = _MODELS_DIR_P / selected_model
                 if os.path.exists(model_path):
                     try:
                         if not YOLO_AVAILABLE:
                             print("YOLO not available, skipping model loading")
                             return
-                        loaded_model = YOLO(model_path)
+                        loaded_model, loaded_model_imgsz = load_yolo_model(model_path)
                         loaded_model_path = selected_model
                         print(f"Successfully loaded model from config: {selected_model}")
                     except Exception as e:
@@ -115,6 +323,9 @@ class ExecuteScriptRequest(BaseModel):
 class DeleteModelRequest(BaseModel):
     name: str
 
+class DeleteDatasetImagesRequest(BaseModel):
+    names: list[str]
+
 class GenerateDatasetRequest(BaseModel):
     target_filename: str
     background_filename: str
@@ -122,10 +333,25 @@ class GenerateDatasetRequest(BaseModel):
     width: int
     height: int
 
-def parse_model_metrics(model_filename):
+# Parsed model metrics keyed by info filename -> (mtime, metrics)
+_metrics_cache = {}
+
+# Metric lines in model info files, e.g. "  mAP50-95:         0.634"
+# (mAP50-95 must come before mAP50 in the alternation)
+_METRIC_RE = re.compile(r'^\s*(Precision \(P\)|Recall \(R\)|mAP50-95|mAP50)\s*:\s*([0-9.eE+-]+)', re.M)
+_METRIC_KEYS = {
+    'Precision (P)': 'p',
+    'Recall (R)': 'r',
+    'mAP50': 'map50',
+    'mAP50-95': 'map50_95'
+}
+
+def parse_model_metrics(model_filename, info_mtime=None):
     """
     Parse metrics from the corresponding model info file.
     Returns default values if file not found or parsing fails.
+    Results are cached until the info file's mtime changes; pass info_mtime
+    (st_mtime_ns) when it is already known to skip the stat call.
     """
     # Generate the expected info file name based on model filename
     # For target_model_20250802_124519.pt -> target_model_20250802_124519.txt
@@ -134,53 +360,43 @@ def parse_model_metrics(model_filename):
     # Use consistent naming: target_model_{timestamp}.txt
     info_filename = f"{base_name}.txt"
     
-    info_path = os.path.join(MODELS_DIR, info_filename)
+    info_path = _MODELS_DIR_P / info_filename
     
     # Default metrics if file not found or parsing fails
     default_metrics = {"p": 0.0, "r": 0.0, "map50": 0.0, "map50_95": 0.0}
     
-    if not os.path.exists(info_path):
-        return default_metrics
+    if info_mtime is None:
+        try:
+            info_mtime = os.stat(info_path).st_mtime_ns
+        except FileNotFoundError:
+            return default_metrics
+    
+    cached = _metrics_cache.get(info_filename)
+    if cached and cached[0] == info_mtime:
+        return cached[1]
     
     try:
         with open(info_path, 'r') as f:
             content = f.read()
             
         metrics = {}
-        lines = content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if 'Precision (P):' in line:
-                metrics['p'] = float(line.split(':')[1].strip())
-            elif 'Recall (R):' in line:
-                metrics['r'] = float(line.split(':')[1].strip())
-            elif 'mAP50:' in line and 'mAP50-95:' not in line:
-                metrics['map50'] = float(line.split(':')[1].strip())
-            elif 'mAP50-95:' in line:
-                metrics['map50_95'] = float(line.split(':')[1].strip())
+        for label, value in _METRIC_RE.findall(content):
+            metrics[_METRIC_KEYS[label]] = float(value)
         
         # Return parsed metrics or defaults if any are missing
-        return {
+        result = {
             "p": metrics.get('p', 0.0),
             "r": metrics.get('r', 0.0),
             "map50": metrics.get('map50', 0.0),
             "map50_95": metrics.get('map50_95', 0.0)
         }
+        _metrics_cache[info_filename] = (info_mtime, result)
+        return result
         
     except Exception as e:
         print(f"Error parsing metrics for {model_filename}: {e}")
         return default_metrics
 
-def has_html_report(model_filename):
-    """
-    Check if an HTML report exists for the given model.
-    """
-    base_name = model_filename.replace('.pt', '')
-    html_filename = f"{base_name}.html"
-    html_path = os.path.join(MODELS_DIR, html_filename)
-    return os.path.exists(html_path)
-
 def resize_with_aspect_ratio(image, target_size, method='pad'):
     """
     Resize image while maintaining aspect ratio.
@@ -193,6 +409,8 @@ def resize_with_aspect_ratio(image, target_size, method='pad'):
     Returns:
         tuple: (resized_image, scale_x, scale_y)
     """
+    from PIL import Image
+    
     original_width, original_height = image.size
     target_width, target_height = target_size
     
@@ -237,21 +455,78 @@ def resize_with_aspect_ratio(image, target_size, method='pad'):
     else:
         raise ValueError("Method must be 'pad' or 'crop'")
 
+def decode_upload_image(upload: UploadFile):
+    """
+    Decode an uploaded image straight to OpenCV's BGR layout (None if it isn't a valid image).
+    Reads the spooled upload file directly so the encoded bytes are released as soon as
+    decoding is done instead of living for the rest of the request.
+    """
+    import cv2
+    import numpy as np
+    
+    upload.file.seek(0)
+    return cv2.imdecode(np.frombuffer(upload.file.read(), np.uint8), cv2.IMREAD_COLOR)
+
+def letterbox(image, new_shape: int, color=(114, 114, 114)):
+    """
+    Resize an OpenCV image to fit a new_shape x new_shape square keeping its aspect
+    ratio, and pad the rest the way YOLO does.
+    
+    Returns:
+        tuple: (letterboxed_image, ratio, (pad_x, pad_y))
+    """
+    import cv2
+    import numpy as np
+    
+    height, width = image.shape[:2]
+    ratio = min(new_shape / height, new_shape / width)
+    new_width, new_height = round(width * ratio), round(height * ratio)
+    pad_x = (new_shape - new_width) // 2
+    pad_y = (new_shape - new_height) // 2
+    
+    # Resize straight into the padded canvas instead of resizing and then copying into a border
+    canvas = np.full((new_shape, new_shape, image.shape[2]), color, dtype=image.dtype)
+    target = canvas[pad_y:pad_y + new_height, pad_x:pad_x + new_width]
+    if (new_width, new_height) != (width, height):
+        cv2.resize(image, (new_width, new_height), dst=target, interpolation=cv2.INTER_LINEAR)
+    else:
+        target[...] = image
+    return canvas, ratio, (pad_x, pad_y)
+
+def scale_boxes_to_original(boxes, ratio: float, pad, original_shape):
+    """Map xyxy boxes from letterboxed coordinates back onto the original image"""
+    import numpy as np
+    
+    pad_x, pad_y = pad
+    boxes = (boxes - np.array([pad_x, pad_y, pad_x, pad_y], dtype=np.float32)) / ratio
+    height, width = original_shape[:2]
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height)
+    return boxes
+
 @app.get("/models")
 async def get_models():
     models = []
-    for filename in os.listdir(MODELS_DIR):
-        if filename.endswith(".pt"):
-            # Parse real metrics from corresponding info file
-            metrics = parse_model_metrics(filename)
+    # A single directory pass provides names and stat info for models, reports and info files
+    with os.scandir(MODELS_DIR) as it:
+        entries = {entry.name: entry for entry in it}
+    
+    for filename, entry in entries.items():
+        # is_file() comes from the directory entry type, so it costs no extra syscall
+        if filename.endswith(".pt") and entry.is_file():
+            base_name = filename.replace('.pt', '')
+            info_entry = entries.get(f"{base_name}.txt")
+            
+            # Parse real metrics from corresponding info file (cached by mtime)
+            metrics = parse_model_metrics(filename, info_entry.stat().st_mtime_ns if info_entry else None)
             models.append({
                 "path": filename,
-                "last_modified": os.path.getmtime(os.path.join(MODELS_DIR, filename)),
+                "last_modified": entry.stat().st_mtime,
                 "p": metrics["p"], 
                 "r": metrics["r"], 
                 "map50": metrics["map50"], 
                 "map50_95": metrics["map50_95"],
-                "has_report": has_html_report(filename)
+                "has_report": f"{base_name}.html" in entries
             })
     return sorted(models, key=lambda x: x['last_modified'], reverse=True)
 
@@ -260,6 +535,13 @@ async def get_models():
 async def get_api_models():
     return await get_models()
 
+class ReportFileResponse(FileResponse):
+    """FileResponse that streams large HTML reports in 1 MiB chunks."""
+    chunk_size = 1024 * 1024
+
+# Reports are written once at the end of training and never modified afterwards
+REPORT_CACHE_CONTROL = "public, max-age=86400"
+
 @app.get("/api/model/report/{model_name}")
 async def get_model_report(model_name: str):
     """
@@ -268,12 +550,36 @@ async def get_model_report(model_name: str):
     # Remove .pt extension if present and add .html
     base_name = model_name.replace('.pt', '')
     html_filename = f"{base_name}.html"
-    html_path = os.path.join(MODELS_DIR, html_filename)
+    html_path = _MODELS_DIR_P / html_filename
     
     if not os.path.exists(html_path):
         raise HTTPException(status_code=404, detail="HTML report not found for this model")
     
-    return FileResponse(html_path, media_type="text/html")
+    return ReportFileResponse(
+        html_path,
+        media_type="text/html",
+        headers={"Cache-Control": REPORT_CACHE_CONTROL}
+    )
+
+def is_plain_filename(name: str) -> bool:
+    """Check that a client-supplied name is a bare file name inside models/ (no path traversal)"""
+    return ".." not in name and "/" not in name and "\\" not in name
+
+@app.get("/api/model/report/{images_dir}/{filename}")
+async def get_model_report_image(images_dir: str, filename: str):
+    """
+    Serve a result image of an HTML report. Reports reference their images relative to
+    the report URL, as {report name}_images/{filename}.
+    """
+    # Security check - only report image directories, no path traversal
+    if not images_dir.endswith("_images") or not all(map(is_plain_filename, (images_dir, filename))):
+        raise HTTPException(status_code=400, detail="Invalid report image path")
+    
+    image_path = _MODELS_DIR_P / images_dir / filename
+    if not os.path.isfile(image_path):
+        raise HTTPException(status_code=404, detail="Report image not found")
+    
+    return FileResponse(image_path, media_type="image/png", headers={"Cache-Control": REPORT_CACHE_CONTROL})
 
 
 
@@ -281,10 +587,20 @@ async def get_model_report(model_name: str):
 async def save_pipeline_config(pipeline_config: dict):
     try:
         # Save pipeline configuration ONLY to the frontend config file (single source of truth)
-        frontend_config_file = "./frontend/config/training-pipeline.json"
-        os.makedirs(os.path.dirname(frontend_config_file), exist_ok=True)
-        with open(frontend_config_file, 'w') as f:
-            json.dump(pipeline_config, f, indent=2)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(PIPELINE_CONFIG_FILE), exist_ok=True)
+        # Write to a temp file and swap it in so readers never see a partial file; the name
+        # is unique per save so overlapping saves never write into each other's file
+        tmp_path = f"{PIPELINE_CONFIG_FILE}.{uuid.uuid4().hex}.tmp"
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                await f.write(orjson.dumps(pipeline_config, option=orjson.OPT_INDENT_2))
+            await asyncio.to_thread(os.replace, tmp_path, PIPELINE_CONFIG_FILE)
+        except BaseException:
+            await asyncio.to_thread(Path(tmp_path).unlink, missing_ok=True)
+            raise
+        
+        # Force the next load to re-read the file
+        _pipeline_cache["mtime"] = None
         
         return {"message": "Pipeline configuration saved successfully", "config": pipeline_config}
     except Exception as e:
@@ -294,10 +610,9 @@ async def save_pipeline_config(pipeline_config: dict):
 async def load_pipeline_config():
     try:
         # Load from the single frontend config file (single source of truth)
-        frontend_config_file = "./frontend/config/training-pipeline.json"
-        if os.path.exists(frontend_config_file):
-            with open(frontend_config_file, 'r') as f:
-                return json.load(f)
+        pipeline_config = await asyncio.to_thread(_get_pipeline_config_cached)
+        if pipeline_config is not None:
+            return pipeline_config
         
         # If file doesn't exist, return a default empty pipeline config
         return {
@@ -309,156 +624,331 @@ async def load_pipeline_config():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load pipeline configuration: {str(e)}")
 
+def remove_model_files(model_name: str):
+    """
+    Remove a model file together with its HTML report and info file.
+    Raises FileNotFoundError if the model file itself doesn't exist.
+    """
+    # Remove the main .pt model file
+    (_MODELS_DIR_P / model_name).unlink()
+    
+    # Get the base name without extension to find related files
+    base_name = os.path.splitext(model_name)[0]
+    
+    # Remove corresponding HTML report and TXT info files if they exist
+    for ext in MODEL_SIDECAR_EXTS:
+        (_MODELS_DIR_P / f"{base_name}{ext}").unlink(missing_ok=True)
+    # Only this model's exports: "cursor.*" also matches e.g. cursor.v2.640-dynamic.onnx
+    export_name = re.compile(re.escape(base_name) + MODEL_EXPORT_SUFFIX_RE)
+    for export in _MODELS_DIR_P.glob(glob.escape(base_name) + ".*"):
+        if export_name.fullmatch(export.name):
+            export.unlink(missing_ok=True)
+    shutil.rmtree(_MODELS_DIR_P / f"{base_name}_images", ignore_errors=True)  # Report images
+    print(f"Removed model {model_name} with its report and info files")
+    
+    _metrics_cache.pop(f"{base_name}.txt", None)
+
 @app.post("/api/model/delete")
 async def delete_yolo_model(req: DeleteModelRequest):
-    model_path = os.path.join(MODELS_DIR, req.name)
-    if os.path.exists(model_path):
-        # Remove the main .pt model file
-        os.remove(model_path)
-        
-        # Get the base name without extension to find related files
-        base_name = os.path.splitext(req.name)[0]
-        
-        # Remove corresponding HTML report file if it exists
-        html_path = os.path.join(MODELS_DIR, f"{base_name}.html")
-        if os.path.exists(html_path):
-            os.remove(html_path)
-            print(f"Removed HTML report: {html_path}")
-        
-        # Remove corresponding TXT info file if it exists
-        txt_path = os.path.join(MODELS_DIR, f"{base_name}.txt")
-        if os.path.exists(txt_path):
-            os.remove(txt_path)
-            print(f"Removed info file: {txt_path}")
-        
-        return {"message": f"Model {req.name} and related files deleted successfully"}
-    else:
+    # Only .pt files directly in models/; the removal also deletes directory trees
+    if not req.name.endswith(".pt") or not is_plain_filename(req.name):
+        raise HTTPException(status_code=400, detail="Invalid model name")
+    
+    try:
+        await asyncio.to_thread(remove_model_files, req.name)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Model {req.name} not found")
+    
+    return {"message": f"Model {req.name} and related files deleted successfully"}
+
+# Strong references to fire-and-forget script tasks so they aren't garbage collected
+script_tasks = set()
 
 @app.post("/api/script/execute")
-async def execute_script(req: ExecuteScriptRequest, background_tasks: BackgroundTasks):
+async def execute_script(req: ExecuteScriptRequest):
     task_id = str(uuid.uuid4())
     log_path = os.path.join(LOGS_DIR, f"{task_id}.log")
     
-    background_tasks.add_task(run_script_execution, task_id, log_path, req.script, req.args)
+    # Run on the event loop instead of occupying a threadpool worker for the whole run
+    task = asyncio.create_task(run_script_execution(task_id, log_path, req.script, req.args))
+    script_tasks.add(task)
+    task.add_done_callback(script_tasks.discard)
     
     return JSONResponse(status_code=202, content={"message": "Script execution started", "task_id": task_id})
 
-def run_script_execution(task_id: str, log_path: str, script: str, args: list):
+async def run_script_execution(task_id: str, log_path: str, script: str, args: list):
     """
     Execute a Python script with arguments and capture output directly in the container.
     Uses the same approach as our working pipeline config - simple file operations.
     """
     tasks[task_id] = {"status": "running", "log_path": log_path, "progress": 0}
+    process = None
     try:
-        with open(log_path, "w") as log_file:
-            log_file.write(f"Starting script execution: {script} {' '.join(args)}\n")
-            log_file.flush()
+        async with aiofiles.open(log_path, "w") as log_file:
+            await log_file.write(f"Starting script execution: {script} {' '.join(args)}\n")
+            await log_file.flush()
             
             # Execute script directly in the current environment
             # Build command to execute the script
             cmd = ["python", script] + args
             
-            log_file.write(f"Command: {' '.join(cmd)}\n")
-            log_file.flush()
+            await log_file.write(f"Command: {' '.join(cmd)}\n")
+            await log_file.flush()
             
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
             )
             
-            # Read output line by line
-            for line in process.stdout:
-                log_file.write(line)
-                log_file.flush()
+            # Copy output to the log in blocks rather than lines, so a long line (e.g. \r-joined
+            # progress bars) can't exceed the stream reader's line limit; the incremental
+            # decoder keeps multi-byte characters split across blocks intact
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            while True:
+                data = await process.stdout.read(PROCESS_OUTPUT_CHUNK_SIZE)
+                if not data:
+                    break
+                await log_file.write(decoder.decode(data))
+            await log_file.write(decoder.decode(b'', final=True))
             
-            process.wait()
+            await process.wait()
             
             if process.returncode == 0:
                 tasks[task_id]["status"] = "completed"
                 tasks[task_id]["progress"] = 100
-                log_file.write(f"\nScript completed successfully with exit code {process.returncode}\n")
+                await log_file.write(f"\nScript completed successfully with exit code {process.returncode}\n")
             else:
                 tasks[task_id]["status"] = "failed"
-                log_file.write(f"\nScript failed with exit code {process.returncode}\n")
+                await log_file.write(f"\nScript failed with exit code {process.returncode}\n")
             
-            log_file.flush()
+            await log_file.flush()
 
     except Exception as e:
         tasks[task_id]["status"] = "failed"
-        with open(log_path, "a") as log_file:
-            log_file.write(f"\nError during script execution: {e}\n")
-            log_file.flush()
+        # Don't leave the script running with nobody draining its pipe
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+        async with aiofiles.open(log_path, "a") as log_file:
+            await log_file.write(f"\nError during script execution: {e}\n")
+            await log_file.flush()
 
 # Pipeline logging functionality
-PIPELINE_LOG_FILE = "logs/pipeline.log"
-pipeline_log_active = False
-
-def init_pipeline_log():
-    """Initialize pipeline log file for a new pipeline execution"""
-    global pipeline_log_active
-    pipeline_log_active = True
-    
-    # Ensure logs directory exists
-    os.makedirs("logs", exist_ok=True)
-    
-    # Create/overwrite pipeline log file
-    with open(PIPELINE_LOG_FILE, "w", encoding="utf-8") as f:
-        f.write(f"=== YOLO Training Pipeline Log ===\n")
-        f.write(f"Started at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write("=" * 50 + "\n\n")
-
-def log_pipeline_message(message: str):
-    """Log a message to the pipeline log file"""
-    global pipeline_log_active
-    if not pipeline_log_active:
-        return
-        
+PIPELINE_LOG_DIR = "logs"
+PIPELINE_LOG_FILE = os.path.join(PIPELINE_LOG_DIR, "pipeline.log")  # Symlink to the latest session log
+
+# Log lines are queued and written by a single writer task that keeps the file
+# open and flushes once per batch instead of reopening the file for every line
+PIPELINE_LOG_BATCH_SIZE = 64
+PIPELINE_LOG_BATCH_INTERVAL = 0.05  # seconds to let a burst of lines accumulate
+
+async def pipeline_log_writer(path: str, queue: asyncio.Queue):
+    """Write queued pipeline log text in batches until a None sentinel is received"""
     try:
-        # Filter out heartbeat messages from log
-        if message.startswith("HEARTBEAT:"):
-            return
-            
-        with open(PIPELINE_LOG_FILE, "a", encoding="utf-8") as f:
-            timestamp = datetime.datetime.now().strftime('%H:%M:%S')
-            f.write(f"[{timestamp}] {message}\n")
-            f.flush()
+        async with aiofiles.open(path, "w", encoding="utf-8") as f:
+            while True:
+                batch = [await queue.get()]
+                await asyncio.sleep(PIPELINE_LOG_BATCH_INTERVAL)
+                while len(batch) < PIPELINE_LOG_BATCH_SIZE and not queue.empty():
+                    batch.append(queue.get_nowait())
+                
+                stop = None in batch
+                if stop:
+                    batch = batch[:batch.index(None)]
+                
+                await f.write("".join(batch))
+                await f.flush()
+                
+                if stop:
+                    return
     except Exception as e:
         print(f"Error writing to pipeline log: {e}")
 
-def finalize_pipeline_log(success: bool = True):
-    """Finalize the pipeline log with completion status"""
-    global pipeline_log_active
-    if not pipeline_log_active:
+# Session logs kept in logs/; older ones are deleted when a new session starts
+PIPELINE_LOG_KEEP = 20
+
+def prune_pipeline_logs(keep: int = PIPELINE_LOG_KEEP, active_paths=frozenset()):
+    """
+    Delete all but the newest keep session logs (logs/pipeline-*.log). Logs in active_paths
+    belong to sessions that are still connected and are never deleted or counted.
+    """
+    try:
+        with os.scandir(PIPELINE_LOG_DIR) as entries:
+            session_logs = [
+                entry for entry in entries
+                if entry.name.startswith("pipeline-") and entry.name.endswith(".log")
+                and entry.path not in active_paths and entry.is_file(follow_symlinks=False)
+            ]
+    except OSError as e:
+        print(f"Could not list pipeline logs: {e}")
         return
-        
+    
+    session_logs.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in session_logs[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError as e:
+            print(f"Could not remove old pipeline log {entry.path}: {e}")
+
+def link_latest_pipeline_log(path: str):
+    """Point logs/pipeline.log at the given session log"""
+    tmp_link = PIPELINE_LOG_FILE + ".tmp"
     try:
-        with open(PIPELINE_LOG_FILE, "a", encoding="utf-8") as f:
-            f.write("\n" + "=" * 50 + "\n")
-            status = "COMPLETED SUCCESSFULLY" if success else "FAILED"
-            f.write(f"Pipeline {status} at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 50 + "\n")
-    except Exception as e:
-        print(f"Error finalizing pipeline log: {e}")
-    finally:
-        pipeline_log_active = False
+        if os.path.lexists(tmp_link):
+            os.remove(tmp_link)
+        os.symlink(os.path.basename(path), tmp_link)
+        os.replace(tmp_link, PIPELINE_LOG_FILE)
+    except OSError as e:
+        print(f"Could not link {PIPELINE_LOG_FILE} to {path}: {e}")
+
+class PipelineLogger:
+    """
+    Pipeline log for a single WebSocket session, written to logs/pipeline-{session_id}.log.
+    Each session has its own file and writer task, so concurrent pipelines don't interfere.
+    """
+    
+    def __init__(self, session_id: str):
+        self.path = os.path.join(PIPELINE_LOG_DIR, f"pipeline-{session_id}.log")
+        self.active = False
+        self._queue = asyncio.Queue()
+        self._writer_task = None
+    
+    async def start(self):
+        """Create the log file for a new pipeline execution"""
+        await asyncio.to_thread(os.makedirs, PIPELINE_LOG_DIR, exist_ok=True)
+        # Make room before this session's log is created, so it is one of the kept ones;
+        # logs of sessions that are still connected (pipeline_loggers) are left alone
+        active_paths = {logger.path for logger in pipeline_loggers.values()} | {self.path}
+        await asyncio.to_thread(prune_pipeline_logs, PIPELINE_LOG_KEEP - 1, active_paths)
+        
+        self.active = True
+        self._queue.put_nowait(
+            f"=== YOLO Training Pipeline Log ===\n"
+            f"Started at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            + "=" * 50 + "\n\n"
+        )
+        self._writer_task = asyncio.create_task(pipeline_log_writer(self.path, self._queue))
+        await asyncio.to_thread(link_latest_pipeline_log, self.path)
+    
+    def log(self, message: str):
+        """Log a message to the pipeline log file"""
+        if not self.active:
+            return
+        
+        # Filter out heartbeat messages from log
+        if message.startswith("HEARTBEAT:"):
+            return
+        
+        timestamp = datetime.datetime.now().strftime('%H:%M:%S')
+        self._queue.put_nowait(f"[{timestamp}] {message}\n")
+    
+    def finalize(self, success: bool = True):
+        """Finalize the pipeline log with completion status"""
+        if not self.active:
+            return
+        
+        self.active = False
+        status = "COMPLETED SUCCESSFULLY" if success else "FAILED"
+        self._queue.put_nowait(
+            "\n" + "=" * 50 + "\n"
+            f"Pipeline {status} at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            + "=" * 50 + "\n"
+        )
+        # Writer closes the file once everything queued so far is written
+        self._queue.put_nowait(None)
+    
+    async def close(self):
+        """Wait for all queued lines to be written and the file to be closed"""
+        if self._writer_task is None:
+            return
+        
+        self.active = False
+        if not self._writer_task.done():
+            self._queue.put_nowait(None)
+            await self._writer_task
+
+# Loggers of the currently connected pipeline sessions, keyed by session_id
+pipeline_loggers = {}
 
-async def send_and_log(websocket, message: str):
-    """Send message to WebSocket and log it to pipeline log"""
+async def send_and_log(websocket, logger: PipelineLogger, message: str):
+    """Send message to WebSocket and log it to the session's pipeline log"""
     try:
         await websocket.send_text(message)
-        log_pipeline_message(message)
+        logger.log(message)
     except:
         # WebSocket connection lost, but still log the message
-        log_pipeline_message(message)
+        logger.log(message)
         raise
 
+# Memory snapshots are shared by all connections for a few seconds, so concurrent
+# pipelines don't each rescan every process in the container
+MEMORY_STATUS_TTL = 10  # seconds
+_mem_cache = {"ts": 0.0, "data": None}
+
+# Command line keywords that identify a training process
+_TRAIN_KEYWORDS = ('train', 'yolo', 'ultralytics')
+
 def get_memory_status():
-    """Get current memory status and training process info"""
+    """Get current memory status and training process info (cached for MEMORY_STATUS_TTL seconds)"""
+    now = time.monotonic()
+    if _mem_cache["data"] is not None and now - _mem_cache["ts"] < MEMORY_STATUS_TTL:
+        return _mem_cache["data"]
+    
+    mem_status = collect_memory_status()
+    if 'error' not in mem_status:
+        _mem_cache["ts"] = now
+        _mem_cache["data"] = mem_status
+    return mem_status
+
+# Python processes below this RSS are left out of memory reports
+PROCESS_MEMORY_THRESHOLD_MB = 50
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def _fast_proc_scan():
+    """
+    Yield (pid, name, memory_mb, cmdline_list) for large python processes by
+    reading /proc directly; comm and cmdline are only read for processes over the threshold
+    """
+    with os.scandir("/proc") as it:
+        for entry in it:
+            if not entry.name.isdigit():
+                continue
+            
+            try:
+                with open(f"{entry.path}/statm", "rb") as f:
+                    rss_pages = int(f.read().split()[1])
+                memory_mb = rss_pages * _PAGE_SIZE / 1024 / 1024
+                if memory_mb <= PROCESS_MEMORY_THRESHOLD_MB:
+                    continue
+                
+                with open(f"{entry.path}/comm", "r") as f:
+                    name = f.read().strip()
+                if 'python' not in name.lower():
+                    continue
+                
+                with open(f"{entry.path}/cmdline", "rb") as f:
+                    cmdline_list = f.read().decode("utf-8", errors="replace").rstrip("\0").split("\0")
+            except (OSError, ValueError, IndexError):
+                # Process exited or isn't readable
+                continue
+            
+            yield int(entry.name), name, memory_mb, cmdline_list
+
+def _psutil_proc_scan():
+    """Same as _fast_proc_scan, through psutil for systems without /proc"""
+    for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
+        try:
+            if 'python' in proc.info['name'].lower():
+                memory_mb = proc.info['memory_info'].rss / 1024 / 1024
+                if memory_mb > PROCESS_MEMORY_THRESHOLD_MB:
+                    yield proc.info['pid'], proc.info['name'], memory_mb, proc.cmdline()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+
+def collect_memory_status():
+    """Collect current memory status and training process info"""
     try:
         # Get system memory
         mem = psutil.virtual_memory()
@@ -467,26 +957,22 @@ def get_memory_status():
         training_processes = []
         python_processes = []
         
-        for proc in psutil.process_iter(['pid', 'name', 'memory_info', 'cmdline']):
-            try:
-                if 'python' in proc.info['name'].lower():
-                    memory_mb = proc.info['memory_info'].rss / 1024 / 1024
-                    if memory_mb > 50:  # Only track processes >50MB
-                        cmdline = ' '.join(proc.info['cmdline'][:3]) if proc.info['cmdline'] else proc.info['name']
-                        
-                        process_info = {
-                            'pid': proc.info['pid'],
-                            'memory_mb': round(memory_mb, 1),
-                            'cmdline': cmdline
-                        }
-                        
-                        python_processes.append(process_info)
-                        
-                        # Check if it's a training process
-                        if any(keyword in cmdline.lower() for keyword in ['train', 'yolo', 'ultralytics']):
-                            training_processes.append(process_info)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+        process_scan = _fast_proc_scan() if os.path.isdir("/proc") else _psutil_proc_scan()
+        for pid, name, memory_mb, cmdline_list in process_scan:
+            cmdline = ' '.join(cmdline_list[:3]) if any(cmdline_list) else name
+            
+            process_info = {
+                'pid': pid,
+                'memory_mb': round(memory_mb, 1),
+                'cmdline': cmdline
+            }
+            
+            python_processes.append(process_info)
+            
+            # Check if it's a training process
+            cmdline_lower = cmdline.lower()
+            if any(keyword in cmdline_lower for keyword in _TRAIN_KEYWORDS):
+                training_processes.append(process_info)
         
         return {
             'container_memory_gb': round(mem.used / 1024**3, 2),
@@ -498,7 +984,7 @@ def get_memory_status():
     except Exception as e:
         return {'error': f'Memory monitoring failed: {str(e)}'}
 
-async def memory_monitoring_task(websocket, stop_event):
+async def memory_monitoring_task(websocket, logger: PipelineLogger, stop_event):
     """Background task for memory monitoring during script execution"""
     monitor_interval = 300  # 5 minutes = 300 seconds
     
@@ -510,11 +996,11 @@ async def memory_monitoring_task(websocket, stop_event):
                     return
                 await asyncio.sleep(1)
             
-            # Get memory status
-            mem_status = get_memory_status()
+            # Get memory status (the /proc scan runs in a worker thread)
+            mem_status = await asyncio.to_thread(get_memory_status)
             
             if 'error' in mem_status:
-                await send_and_log(websocket, f"MEMORY_ERROR: {mem_status['error']}")
+                await send_and_log(websocket, logger, f"MEMORY_ERROR: {mem_status['error']}")
                 continue
             
             # Format memory report
@@ -535,16 +1021,80 @@ async def memory_monitoring_task(websocket, stop_event):
                         python_info.append(f"PID{proc['pid']}:{proc['memory_mb']}MB")
                     mem_report += f" | Python: {', '.join(python_info)}"
             
-            await send_and_log(websocket, mem_report)
+            await send_and_log(websocket, logger, mem_report)
             
         except Exception as e:
             try:
-                await send_and_log(websocket, f"MEMORY_ERROR: Monitoring failed - {str(e)}")
+                await send_and_log(websocket, logger, f"MEMORY_ERROR: Monitoring failed - {str(e)}")
             except:
                 # WebSocket might be closed, just log and continue
-                log_pipeline_message(f"MEMORY_ERROR: Monitoring failed - {str(e)}")
+                logger.log(f"MEMORY_ERROR: Monitoring failed - {str(e)}")
                 pass
 
+async def terminate_process(process, timeout: float = 5):
+    """Terminate a subprocess gracefully, force killing it if it doesn't exit in time.
+    Returns True if the process exited after SIGTERM, False if it had to be killed."""
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return False
+
+# Maximum number of bytes taken from a process pipe per read
+PROCESS_OUTPUT_CHUNK_SIZE = 65536
+
+async def pump_process_output(stream, websocket, logger: PipelineLogger):
+    """
+    Forward process output to the WebSocket line by line until EOF.
+    Reading and sending are decoupled by a bounded queue, so the next lines are
+    read from the pipe while earlier ones are still being sent.
+    """
+    queue = asyncio.Queue(maxsize=256)
+    
+    async def queue_line(line: bytes):
+        line = line.decode('utf-8', errors='ignore').strip()
+        if line:
+            await queue.put(line)
+    
+    async def read_lines():
+        try:
+            # Read large blocks and split them on newlines, carrying any incomplete
+            # trailing line over to the next block
+            buffer = bytearray()
+            while True:
+                data = await stream.read(PROCESS_OUTPUT_CHUNK_SIZE)
+                if not data:
+                    break
+                
+                buffer += data
+                lines = buffer.split(b'\n')
+                buffer = lines.pop()
+                for line in lines:
+                    await queue_line(line)
+            
+            # Output that didn't end with a newline
+            if buffer:
+                await queue_line(buffer)
+        except Exception as e:
+            logger.log(f"Error reading process output: {str(e)}")
+        
+        # Signal end of output to the sender
+        await queue.put(None)
+    
+    reader = asyncio.create_task(read_lines())
+    try:
+        while True:
+            line = await queue.get()
+            if line is None:
+                return
+            await send_and_log(websocket, logger, line)
+    finally:
+        # Stop reading if sending failed or the pump was cancelled
+        reader.cancel()
+
 @app.websocket("/api/script/ws/execute")
 async def websocket_execute_script(websocket: WebSocket):
     await websocket.accept()
@@ -553,169 +1103,131 @@ async def websocket_execute_script(websocket: WebSocket):
     memory_stop_event = asyncio.Event()
     memory_task = None
     process = None
+    reader_task = None
+    receive_task = None
     session_id = str(uuid.uuid4())
+    logger = PipelineLogger(session_id)
+    pipeline_loggers[session_id] = logger
     
     try:
-        # Initialize pipeline log on first connection (start of pipeline)
-        init_pipeline_log()
+        # Initialize the session's pipeline log (start of pipeline)
+        await logger.start()
         
-        await send_and_log(websocket, "WebSocket connected successfully")
+        await send_and_log(websocket, logger, "WebSocket connected successfully")
         
         # Receive script execution request
         data = await websocket.receive_text()
-        request_data = json.loads(data)
+        request_data = orjson.loads(data)
         script_path = request_data.get('script_path')
         args = request_data.get('args', [])
         
         if not script_path:
-            await send_and_log(websocket, "EXECUTION_ERROR: No script path provided")
-            finalize_pipeline_log(False)
+            await send_and_log(websocket, logger, "EXECUTION_ERROR: No script path provided")
+            logger.finalize(False)
             return
         
         # Start memory monitoring in background
-        memory_task = asyncio.create_task(memory_monitoring_task(websocket, memory_stop_event))
+        memory_task = asyncio.create_task(memory_monitoring_task(websocket, logger, memory_stop_event))
         
-        # Execute the script with real-time output using PTY
+        # Execute the script with real-time output streamed through a pipe
         try:
-            cmd = ["stdbuf", "-o0", "-e0", "python", "-u", script_path] + args
-            await send_and_log(websocket, f"Executing: {' '.join(cmd)}")
+            cmd = ["python", "-u", script_path] + args
+            await send_and_log(websocket, logger, f"Executing: {' '.join(cmd)}")
             
             # Send initial memory status
-            initial_mem = get_memory_status()
+            initial_mem = await asyncio.to_thread(get_memory_status)
             if 'error' not in initial_mem:
-                await send_and_log(websocket, f"MEMORY_INITIAL: Container {initial_mem['container_memory_gb']}GB/{initial_mem['container_total_gb']}GB ({initial_mem['container_percent']}%) - Starting execution")
+                await send_and_log(websocket, logger, f"MEMORY_INITIAL: Container {initial_mem['container_memory_gb']}GB/{initial_mem['container_total_gb']}GB ({initial_mem['container_percent']}%) - Starting execution")
             
-            # Create PTY for real-time output
-            master, slave = pty.openpty()
+            # Keep any Python processes the script starts unbuffered as well
+            env = os.environ.copy()
+            env["PYTHONUNBUFFERED"] = "1"
             
-            # Start subprocess with PTY
-            process = subprocess.Popen(
-                cmd,
-                stdout=slave,
-                stderr=slave,
-                stdin=slave
+            # Start subprocess with stdout/stderr merged into one pipe
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                stdin=asyncio.subprocess.DEVNULL,
+                env=env
             )
             
             # Store process reference for potential cancellation
             active_processes[session_id] = process
             
-            # Close slave end in parent
-            os.close(slave)
-            
-            # Read output in real-time
-            last_heartbeat = time.time()
+            # Forward output and listen for client messages (potential cancellation) concurrently;
+            # both are awaited, so an idle process costs no CPU
             heartbeat_interval = 30  # Send heartbeat every 30 seconds for better connection stability
             cancelled = False
+            reader_task = asyncio.create_task(pump_process_output(process.stdout, websocket, logger))
+            receive_task = asyncio.create_task(websocket.receive_text())
             
-            while process.poll() is None:
-                # Check for incoming WebSocket messages (potential cancellation)
-                try:
-                    # Non-blocking check for WebSocket messages
-                    message = await asyncio.wait_for(websocket.receive_text(), timeout=0.01)
-                    if message == "CANCEL":
+            while True:
+                done, _ = await asyncio.wait(
+                    {reader_task, receive_task},
+                    timeout=heartbeat_interval,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                if reader_task in done:
+                    if reader_task.exception() is not None:
+                        # Connection lost while sending output; the line was still logged
+                        print(f"WebSocket connection lost, but continuing process execution: {script_path}")
                         cancelled = True
-                        log_pipeline_message("Cancellation requested by user")
-                        break
-                except asyncio.TimeoutError:
-                    pass  # No message received, continue
-                except Exception:
-                    # WebSocket connection lost
-                    cancelled = True
-                    log_pipeline_message("WebSocket connection lost - treating as cancellation")
                     break
                 
-                ready, _, _ = select.select([master], [], [], 0.1)
-                if ready:
+                if receive_task in done:
                     try:
-                        data = os.read(master, 1024)
-                        if data:
-                            lines = data.decode('utf-8', errors='ignore').strip()
-                            if lines:
-                                for line in lines.split('\n'):
-                                    if line.strip():
-                                        try:
-                                            await send_and_log(websocket, line.strip())
-                                        except:
-                                            # Connection lost, but continue process and logging
-                                            log_pipeline_message(line.strip())
-                                            print(f"WebSocket connection lost, but continuing process execution: {script_path}")
-                                            cancelled = True
-                                            break
-                                if cancelled:
-                                    break
-                            last_heartbeat = time.time()
-                    except OSError:
+                        message = receive_task.result()
+                    except Exception:
+                        # WebSocket connection lost
+                        cancelled = True
+                        logger.log("WebSocket connection lost - treating as cancellation")
                         break
-                
-                # Send heartbeat to keep connection alive during long operations
-                current_time = time.time()
-                if current_time - last_heartbeat > heartbeat_interval:
-                    try:
-                        await websocket.send_text("HEARTBEAT: Process running...")
-                        last_heartbeat = current_time
-                    except:
-                        # Connection lost, treat as cancellation
-                        print(f"WebSocket connection lost during heartbeat: {script_path}")
+                    
+                    if message == "CANCEL":
                         cancelled = True
+                        logger.log("Cancellation requested by user")
                         break
+                    
+                    # Ignore any other message and keep listening
+                    receive_task = asyncio.create_task(websocket.receive_text())
+                    continue
                 
-                # Small sleep to prevent busy waiting
-                await asyncio.sleep(0.01)
+                # Send heartbeat to keep connection alive during long operations
+                try:
+                    await websocket.send_text("HEARTBEAT: Process running...")
+                except:
+                    # Connection lost, treat as cancellation
+                    print(f"WebSocket connection lost during heartbeat: {script_path}")
+                    cancelled = True
+                    break
             
             # Handle cancellation
             if cancelled:
-                log_pipeline_message("Process execution cancelled - terminating")
-                if process.poll() is None:  # Process still running
+                logger.log("Process execution cancelled - terminating")
+                if process.returncode is None:  # Process still running
                     try:
-                        process.terminate()
-                        process.wait(timeout=5)
-                        log_pipeline_message("Process terminated successfully")
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                        process.wait()
-                        log_pipeline_message("Process forcefully killed")
+                        if await terminate_process(process):
+                            logger.log("Process terminated successfully")
+                        else:
+                            logger.log("Process forcefully killed")
                     except Exception as e:
-                        log_pipeline_message(f"Error terminating process: {str(e)}")
+                        logger.log(f"Error terminating process: {str(e)}")
                 
-                finalize_pipeline_log(False)
+                logger.finalize(False)
                 return
             
-            # Read any remaining output
-            try:
-                while True:
-                    ready, _, _ = select.select([master], [], [], 0.1)
-                    if ready:
-                        data = os.read(master, 1024)
-                        if data:
-                            lines = data.decode('utf-8', errors='ignore').strip()
-                            if lines:
-                                for line in lines.split('\n'):
-                                    if line.strip():
-                                        try:
-                                            await send_and_log(websocket, line.strip())
-                                        except:
-                                            # Connection lost, just log but continue
-                                            log_pipeline_message(line.strip())
-                                            print(f"WebSocket connection lost while reading final output: {script_path}")
-                                            pass
-                    else:
-                        break
-            except OSError:
-                pass
-            
-            # Close PTY
-            os.close(master)
-            
-            # Wait for process to complete
-            return_code = process.wait()
+            # Wait for process to complete (all output has been forwarded at EOF)
+            return_code = await process.wait()
             
             # Send final memory status
-            final_mem = get_memory_status()
+            final_mem = await asyncio.to_thread(get_memory_status)
             if 'error' not in final_mem:
                 try:
-                    await send_and_log(websocket, f"MEMORY_FINAL: Container {final_mem['container_memory_gb']}GB/{final_mem['container_total_gb']}GB ({final_mem['container_percent']}%) - Execution completed")
+                    await send_and_log(websocket, logger, f"MEMORY_FINAL: Container {final_mem['container_memory_gb']}GB/{final_mem['container_total_gb']}GB ({final_mem['container_percent']}%) - Execution completed")
                 except:
-                    log_pipeline_message(f"MEMORY_FINAL: Container {final_mem['container_memory_gb']}GB/{final_mem['container_total_gb']}GB ({final_mem['container_percent']}%) - Execution completed")
+                    logger.log(f"MEMORY_FINAL: Container {final_mem['container_memory_gb']}GB/{final_mem['container_total_gb']}GB ({final_mem['container_percent']}%) - Execution completed")
             
             # Log completion regardless of WebSocket status
             print(f"Process completed: {script_path}, exit code: {return_code}")
@@ -723,33 +1235,38 @@ async def websocket_execute_script(websocket: WebSocket):
             # Try to send completion message, but don't fail if connection is lost
             try:
                 if return_code == 0:
-                    await send_and_log(websocket, "EXECUTION_FINISHED")
-                    finalize_pipeline_log(True)
+                    await send_and_log(websocket, logger, "EXECUTION_FINISHED")
+                    logger.finalize(True)
                 else:
-                    await send_and_log(websocket, f"EXECUTION_ERROR: Script failed with exit code {return_code}")
-                    finalize_pipeline_log(False)
+                    await send_and_log(websocket, logger, f"EXECUTION_ERROR: Script failed with exit code {return_code}")
+                    logger.finalize(False)
             except:
                 # Connection lost, but process completed - this is fine
                 if return_code == 0:
-                    log_pipeline_message("EXECUTION_FINISHED")
-                    finalize_pipeline_log(True)
+                    logger.log("EXECUTION_FINISHED")
+                    logger.finalize(True)
                 else:
-                    log_pipeline_message(f"EXECUTION_ERROR: Script failed with exit code {return_code}")
-                    finalize_pipeline_log(False)
+                    logger.log(f"EXECUTION_ERROR: Script failed with exit code {return_code}")
+                    logger.finalize(False)
                 print(f"WebSocket connection lost, but process completed successfully: {script_path}")
                 pass
                 
         except Exception as e:
-            await send_and_log(websocket, f"EXECUTION_ERROR: {str(e)}")
-            finalize_pipeline_log(False)
+            await send_and_log(websocket, logger, f"EXECUTION_ERROR: {str(e)}")
+            logger.finalize(False)
             
     except Exception as e:
         try:
-            await send_and_log(websocket, f"EXECUTION_ERROR: {str(e)}")
+            await send_and_log(websocket, logger, f"EXECUTION_ERROR: {str(e)}")
         except:
-            log_pipeline_message(f"EXECUTION_ERROR: {str(e)}")
-        finalize_pipeline_log(False)
+            logger.log(f"EXECUTION_ERROR: {str(e)}")
+        logger.finalize(False)
     finally:
+        # Stop forwarding output and listening for client messages
+        for pending_task in (reader_task, receive_task):
+            if pending_task and not pending_task.done():
+                pending_task.cancel()
+        
         # Cleanup: stop memory monitoring and terminate process if needed
         if memory_task:
             memory_stop_event.set()
@@ -760,31 +1277,28 @@ async def websocket_execute_script(websocket: WebSocket):
         
         # Clean up process reference and handle termination
         if session_id in active_processes:
-            if process and process.poll() is None:
+            if process and process.returncode is None:
                 try:
                     # Check if WebSocket was closed due to cancellation
                     # If the process is still running and WebSocket closed, it might be a cancellation
                     print(f"Cleaning up process for session {session_id}")
                     
-                    # Try graceful termination first
-                    process.terminate()
-                    
-                    # Wait a bit for graceful shutdown
-                    try:
-                        process.wait(timeout=5)
-                        log_pipeline_message(f"Process terminated gracefully (PID: {process.pid})")
-                    except subprocess.TimeoutExpired:
-                        # Force kill if graceful termination failed
-                        process.kill()
-                        process.wait()
-                        log_pipeline_message(f"Process forcefully killed (PID: {process.pid})")
+                    # Try graceful termination first, force kill if it doesn't exit in time
+                    if await terminate_process(process):
+                        logger.log(f"Process terminated gracefully (PID: {process.pid})")
+                    else:
+                        logger.log(f"Process forcefully killed (PID: {process.pid})")
                         
                 except Exception as e:
-                    log_pipeline_message(f"Error terminating process: {str(e)}")
+                    logger.log(f"Error terminating process: {str(e)}")
                     
             # Remove from active processes
             del active_processes[session_id]
         
+        # Flush and close the session's pipeline log
+        await logger.close()
+        del pipeline_loggers[session_id]
+        
         try:
             await websocket.close()
         except:
@@ -797,7 +1311,7 @@ async def get_active_processes():
     for session_id, process in active_processes.items():
         process_info[session_id] = {
             "pid": process.pid,
-            "status": "running" if process.poll() is None else "finished",
+            "status": "running" if process.returncode is None else "finished",
             "return_code": process.returncode
         }
     return {"active_processes": process_info, "count": len(process_info)}
@@ -805,7 +1319,7 @@ async def get_active_processes():
 @app.post("/api/model/load")
 async def load_model(req: SetModelRequest):
     """Load a YOLO model for testing. Called when user selects a model."""
-    global loaded_model, loaded_model_path
+    global loaded_model, loaded_model_path, loaded_model_imgsz
     
     try:
         # Check YOLO availability
@@ -814,15 +1328,20 @@ async def load_model(req: SetModelRequest):
         
         # Extract model filename from path
         model_filename = os.path.basename(req.path)
-        full_model_path = os.path.join(MODELS_DIR, model_filename)
+        full_model_path = _MODELS_DIR_P / model_filename
         
         # Check if model exists
         if not os.path.exists(full_model_path):
             raise HTTPException(status_code=404, detail=f"Model not found: {model_filename}")
         
-        # Load the model
+        # Let the startup load finish first so it can't replace the model selected here
+        if startup_model_task is not None and not startup_model_task.done():
+            await asyncio.shield(startup_model_task)
+        
+        # Load and warm up the model (exporting to ONNX can take a while, so keep it
+        # off the event loop); load_time covers both so it reflects when the model is ready
         start_time = time.time()
-        loaded_model = YOLO(full_model_path)
+        loaded_model, loaded_model_imgsz = await asyncio.to_thread(load_yolo_model, full_model_path)
         loaded_model_path = model_filename
         load_time = time.time() - start_time
         
@@ -838,6 +1357,93 @@ async def load_model(req: SetModelRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load model: {str(e)}")
 
+# Number of dataset images used to calibrate INT8 activation ranges
+QUANT_CALIBRATION_IMAGES = 100
+
+def quantize_model_int8(model_filename: str) -> Path:
+    """Export a model to ONNX and statically quantize it to INT8, calibrated on synthetic dataset images"""
+    import cv2
+    import onnxruntime
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+    from ultralytics import YOLO
+    
+    model_path = _MODELS_DIR_P / model_filename
+    model = YOLO(model_path)
+    imgsz = get_model_imgsz(model)
+    onnx_path = export_fp32_onnx_model(model, model_path, imgsz)
+    int8_path = int8_model_path(model_path, imgsz)
+    
+    images_path = get_dataset_path("synthetic") / "images"
+    if not images_path.is_dir():
+        raise ValueError("Synthetic dataset not found, generate it before quantizing")
+    calibration_files = get_dataset_index(images_path)["images"][:QUANT_CALIBRATION_IMAGES]
+    if not calibration_files:
+        raise ValueError("No calibration images found in the synthetic dataset")
+    
+    session = onnxruntime.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+    del session
+    
+    class DatasetCalibrationReader(CalibrationDataReader):
+        """Feed dataset images to the quantizer as normalized NCHW RGB tensors"""
+        
+        def __init__(self):
+            self._files = iter(calibration_files)
+        
+        def get_next(self):
+            for filename in self._files:
+                image = cv2.imread(str(images_path / filename))
+                if image is not None:
+                    model_input, _, _ = letterbox(image, imgsz)
+                    blob = cv2.dnn.blobFromImage(model_input, 1 / 255.0, swapRB=True)
+                    return {input_name: blob}
+            return None
+    
+    quantize_static(
+        str(onnx_path),
+        str(int8_path),
+        DatasetCalibrationReader(),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True
+    )
+    return int8_path
+
+@app.post("/api/model/quantize")
+async def quantize_model(req: SetModelRequest):
+    """Create an INT8 ONNX version of a model for faster CPU inference"""
+    global loaded_model, loaded_model_path, loaded_model_imgsz
+    
+    if not YOLO_AVAILABLE or not ONNX_AVAILABLE:
+        raise HTTPException(status_code=500, detail="YOLO and onnxruntime are required for quantization")
+    
+    model_filename = os.path.basename(req.path)
+    if not (_MODELS_DIR_P / model_filename).exists():
+        raise HTTPException(status_code=404, detail=f"Model not found: {model_filename}")
+    
+    try:
+        start_time = time.time()
+        int8_path = await asyncio.to_thread(quantize_model_int8, model_filename)
+        quantize_time = time.time() - start_time
+        
+        # Switch the loaded model over to the quantized version
+        if loaded_model_path == model_filename:
+            loaded_model, loaded_model_imgsz = await asyncio.to_thread(load_yolo_model, _MODELS_DIR_P / model_filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError as e:
+        raise HTTPException(status_code=500, detail=f"Required packages not installed: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to quantize model: {str(e)}")
+    
+    return {
+        "success": True,
+        "message": f"Model {model_filename} quantized to INT8 successfully",
+        "quantized_model": int8_path.name,
+        "quantize_time": round(quantize_time, 2)
+    }
+
 @app.get("/api/model/loaded")
 async def get_loaded_model():
     """Get information about the currently loaded model"""
@@ -846,17 +1452,84 @@ async def get_loaded_model():
     if loaded_model is None or loaded_model_path is None:
         return {
             "loaded": False,
+            "loading": not model_ready,
             "model_path": None
         }
     
     return {
         "loaded": True,
+        "loading": False,
         "model_path": loaded_model_path
     }
 
+# Detection requests are queued and run by a single worker, which batches requests
+# arriving together into one model call and keeps inference off the event loop
+INFERENCE_BATCH_SIZE = 8
+INFERENCE_BATCH_WAIT = 0.005  # seconds to let concurrent requests join a batch
+_inference_queue = None
+
+def predict_batch(images, confidence: float):
+    """Run letterboxed BGR images through the loaded model as one normalized NCHW tensor"""
+    import cv2
+    import torch
+    
+    # Single fused pass for BGR->RGB, HWC->CHW and /255 instead of ultralytics'
+    # separate numpy steps (each of which copies the batch)
+    blob = cv2.dnn.blobFromImages(images, 1 / 255.0, swapRB=True)
+    device = get_inference_device()
+    return loaded_model(torch.from_numpy(blob), conf=confidence, device=device, half=device != "cpu")
+
+async def inference_worker(queue: asyncio.Queue):
+    """Run queued (image, confidence, future) requests through the loaded model in batches"""
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(INFERENCE_BATCH_WAIT)
+        while len(batch) < INFERENCE_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        
+        # Images can only share a model call when they use the same confidence threshold and
+        # input size (a request queued before a model switch was letterboxed for the old model)
+        groups = {}
+        for image, confidence, future in batch:
+            groups.setdefault((confidence, image.shape), []).append((image, future))
+        
+        for (confidence, _), requests in groups.items():
+            try:
+                results = await asyncio.to_thread(predict_batch, [image for image, _ in requests], confidence)
+            except Exception as e:
+                for _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(requests, results):
+                if not future.done():
+                    future.set_result([result])
+
+def start_inference_worker() -> asyncio.Task:
+    """Create the inference queue and start its worker task"""
+    global _inference_queue
+    _inference_queue = asyncio.Queue()
+    return asyncio.create_task(inference_worker(_inference_queue))
+
+async def run_inference(image, confidence: float):
+    """Queue an image for the inference worker and wait for its results"""
+    future = asyncio.get_running_loop().create_future()
+    await _inference_queue.put((image, confidence, future))
+    return await future
+
+@lru_cache(maxsize=1024)
+def get_label_size(label: str, font_scale: float, thickness: int):
+    """Text size of an annotation label; labels repeat a lot (two-decimal confidences, class ids)"""
+    import cv2
+    return cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)[0]
+
 @app.post("/api/model/test")
 async def test_model(image: UploadFile = File(...), confidence: float = Form(0.25)):
     """Test the currently loaded model on a provided image to detect targets."""
+    import base64
+    import cv2
+    import numpy as np
     global loaded_model, loaded_model_path
     
     # Validate confidence threshold
@@ -864,6 +1537,7 @@ async def test_model(image: UploadFile = File(...), confidence: float = Form(0.2
         raise HTTPException(status_code=400, detail="Confidence threshold must be between 0.01 and 1.0")
     
     # Check if a model is loaded
+    require_model_ready()
     if loaded_model is None or loaded_model_path is None:
         raise HTTPException(status_code=400, detail="No model is currently loaded. Please select a model first.")
     
@@ -872,66 +1546,67 @@ async def test_model(image: UploadFile = File(...), confidence: float = Form(0.2
         raise HTTPException(status_code=400, detail="File must be an image")
     
     try:
-        # Read and process the uploaded image
-        image_bytes = await image.read()
-        
-        # Convert to PIL Image
-        pil_image = Image.open(io.BytesIO(image_bytes))
-        
-        # Convert PIL to OpenCV format (RGB to BGR)
-        opencv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        # Decode the uploaded image in a worker thread
+        opencv_image = await asyncio.to_thread(decode_upload_image, image)
+        if opencv_image is None:
+            raise HTTPException(status_code=400, detail="Could not decode image")
         
         # Record processing start time
         start_time = time.time()
         
         # Run inference using the pre-loaded model with custom confidence
-        results = loaded_model(opencv_image, conf=confidence, device='cpu')  # Use CPU for consistency
+        # Letterbox to the model's input size up front instead of having the detector
+        # resize the full-resolution upload; boxes are mapped back afterwards
+        model_input, ratio, pad = letterbox(opencv_image, loaded_model_imgsz)
+        results = await run_inference(model_input, confidence)
         
         # Calculate processing time
         processing_time = time.time() - start_time
         
         # Process results
         detections = []
-        annotated_image = opencv_image.copy()
+        # The model ran on a letterboxed copy, so annotate the decoded upload in place
+        annotated_image = opencv_image
         
         # Extract detection information
         for result in results:
             if result.boxes is not None:
-                for box in result.boxes:
-                    # Get box coordinates
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    confidence = float(box.conf[0].cpu().numpy())
-                    class_id = int(box.cls[0].cpu().numpy())
+                # Transfer each tensor once instead of three small transfers per box
+                boxes_xyxy = scale_boxes_to_original(result.boxes.xyxy.cpu().numpy(), ratio, pad, opencv_image.shape)
+                box_confidences = result.boxes.conf.cpu().numpy()
+                class_ids = result.boxes.cls.cpu().numpy().astype(np.int32)
+                
+                for (x1, y1, x2, y2), box_confidence, class_id in zip(boxes_xyxy, box_confidences, class_ids):
+                    box_confidence = float(box_confidence)
                     
                     detections.append({
                         "bbox": [float(x1), float(y1), float(x2), float(y2)],
-                        "confidence": confidence,
-                        "class_id": class_id,
+                        "confidence": box_confidence,
+                        "class_id": int(class_id),
                         "class_name": "target"
                     })
-                    
-                    # Draw bounding box on image
-                    cv2.rectangle(annotated_image, (int(x1), int(y1)), (int(x2), int(y2)), (0, 255, 0), 2)
-                    
-                    # Add confidence label
-                    label = f"Target: {confidence:.2f}"
-                    label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
-                    cv2.rectangle(annotated_image, (int(x1), int(y1) - label_size[1] - 10), 
-                                (int(x1) + label_size[0], int(y1)), (0, 255, 0), -1)
-                    cv2.putText(annotated_image, label, (int(x1), int(y1) - 5), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2)
-        
-        # Convert annotated image back to base64 for frontend display
-        annotated_image_rgb = cv2.cvtColor(annotated_image, cv2.COLOR_BGR2RGB)
-        annotated_pil = Image.fromarray(annotated_image_rgb)
-        
-        # Save to bytes
-        img_buffer = io.BytesIO()
-        annotated_pil.save(img_buffer, format='JPEG', quality=90)
-        img_buffer.seek(0)
-        
-        # Encode to base64
-        annotated_image_b64 = base64.b64encode(img_buffer.getvalue()).decode()
+        
+        if detections:
+            boxes_px = np.array([detection["bbox"] for detection in detections]).astype(np.int32)
+            
+            # Draw all bounding boxes in a single call (corners in x1y1, x2y1, x2y2, x1y2 order)
+            outlines = boxes_px[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+            cv2.polylines(annotated_image, list(outlines), True, (0, 255, 0), 2)
+            
+            # Add confidence labels
+            for (x1, y1, _, _), detection in zip(boxes_px.tolist(), detections):
+                label = f"Target: {detection['confidence']:.2f}"
+                label_w, label_h = get_label_size(label, 0.5, 2)
+                cv2.rectangle(annotated_image, (x1, y1 - label_h - 10), 
+                            (x1 + label_w, y1), (0, 255, 0), -1)
+                cv2.putText(annotated_image, label, (x1, y1 - 5), 
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2)
+        
+        # Encode annotated image to JPEG, then base64 for frontend display
+        ok, jpeg = cv2.imencode('.jpg', annotated_image, [int(cv2.IMWRITE_JPEG_QUALITY), 90])
+        if not ok:
+            raise RuntimeError("Failed to encode annotated image")
+        annotated_image_b64 = base64.b64encode(jpeg.tobytes()).decode('ascii')
         
         return {
             "success": True,
@@ -943,6 +1618,8 @@ async def test_model(image: UploadFile = File(...), confidence: float = Form(0.2
             "image_size": [opencv_image.shape[1], opencv_image.shape[0]]  # width, height
         }
         
+    except HTTPException:
+        raise
     except ImportError as e:
         raise HTTPException(status_code=500, detail=f"Required packages not installed: {str(e)}")
     except Exception as e:
@@ -951,6 +1628,7 @@ async def test_model(image: UploadFile = File(...), confidence: float = Form(0.2
 @app.post("/api/model/detect")
 async def detect_target(image: UploadFile = File(...), confidence: float = Form(0.25)):
     """Detect target in an image and return the highest confidence detection with center coordinates."""
+    import numpy as np
     global loaded_model, loaded_model_path
     
     # Validate confidence threshold
@@ -958,6 +1636,7 @@ async def detect_target(image: UploadFile = File(...), confidence: float = Form(
         raise HTTPException(status_code=400, detail="Confidence threshold must be between 0.01 and 1.0")
     
     # Check if a model is loaded
+    require_model_ready()
     if loaded_model is None or loaded_model_path is None:
         raise HTTPException(status_code=400, detail="No model is currently loaded. Please select a model first.")
     
@@ -966,29 +1645,30 @@ async def detect_target(image: UploadFile = File(...), confidence: float = Form(
         raise HTTPException(status_code=400, detail="File must be an image")
     
     try:
-        # Read and process the uploaded image
-        image_bytes = await image.read()
-        
-        # Convert to PIL Image
-        pil_image = Image.open(io.BytesIO(image_bytes))
-        
-        # Convert PIL to OpenCV format (RGB to BGR)
-        opencv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        # Decode the uploaded image in a worker thread
+        opencv_image = await asyncio.to_thread(decode_upload_image, image)
+        if opencv_image is None:
+            raise HTTPException(status_code=400, detail="Could not decode image")
         
         # Run inference using the pre-loaded model with custom confidence
-        results = loaded_model(opencv_image, conf=confidence, device='cpu')  # Use CPU for consistency
+        # Letterbox to the model's input size up front instead of having the detector
+        # resize the full-resolution upload; boxes are mapped back afterwards
+        model_input, ratio, pad = letterbox(opencv_image, loaded_model_imgsz)
+        results = await run_inference(model_input, confidence)
         
         # Find the highest confidence detection
         best_box = None
         max_conf = 0.0
         
         for result in results:
-            if result.boxes is not None:
-                for box in result.boxes:
-                    confidence = float(box.conf[0].cpu().numpy())
-                    if confidence > max_conf:
-                        max_conf = confidence
-                        best_box = box.xyxy[0].cpu().numpy()
+            if result.boxes is not None and len(result.boxes):
+                box_confidences = result.boxes.conf.cpu().numpy()
+                best_idx = int(np.argmax(box_confidences))
+                if box_confidences[best_idx] > max_conf:
+                    max_conf = float(box_confidences[best_idx])
+                    best_box = scale_boxes_to_original(
+                        result.boxes.xyxy[best_idx:best_idx + 1].cpu().numpy(), ratio, pad, opencv_image.shape
+                    )[0]
         
         # Return result based on detection
         if best_box is not None:
@@ -1005,39 +1685,135 @@ async def detect_target(image: UploadFile = File(...), confidence: float = Form(
         else:
             return {"status": "not_found"}
             
+    except HTTPException:
+        raise
     except ImportError as e:
         raise HTTPException(status_code=500, detail=f"Required packages not installed: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Target detection failed: {str(e)}")
 
 # Dataset management generic methods
-def get_dataset_path(dataset_type: str) -> str:
+TRAINING_DATA_ROOT = Path("/app/training_scripts/data")
+DATASET_ROOTS = {
+    "synthetic": TRAINING_DATA_ROOT / "generated_dataset",
+    "custom": TRAINING_DATA_ROOT / "custom_dataset",
+}
+BACKGROUNDS_ROOT = TRAINING_DATA_ROOT / "backgrounds"
+TARGETS_ROOT = TRAINING_DATA_ROOT / "cursors"
+
+def get_dataset_path(dataset_type: str) -> Path:
     """Get the dataset path based on type (synthetic or custom)"""
-    if dataset_type == "synthetic":
-        return "/app/training_scripts/data/generated_dataset"
-    elif dataset_type == "custom":
-        return "/app/training_scripts/data/custom_dataset"
-    else:
+    try:
+        return DATASET_ROOTS[dataset_type]
+    except KeyError:
         raise ValueError(f"Invalid dataset type: {dataset_type}")
 
+DATASET_IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif')
+
+# Sorted image listing and image dimensions per images directory, reused until
+# the directory's mtime changes (any image added, deleted or renamed)
+_dataset_index_cache = {}
+
+def get_dataset_index(images_path: Path) -> dict:
+    """Return the cached index {"images": sorted names, "dims": {name: (mtime, w, h)}} for a directory"""
+    mtime = os.stat(images_path).st_mtime_ns
+    index = _dataset_index_cache.get(images_path)
+    if index is not None and index["mtime"] == mtime:
+        return index
+    
+    with os.scandir(images_path) as it:
+        all_images = sorted(  # Sort alphabetically
+            entry.name for entry in it
+            if entry.name.lower().endswith(DATASET_IMAGE_EXTS) and entry.is_file()
+        )
+    
+    # Keep known dimensions of images that are still present
+    old_dims = index["dims"] if index is not None else {}
+    present = set(all_images)
+    dims = {name: value for name, value in old_dims.items() if name in present}
+    
+    index = {"mtime": mtime, "images": all_images, "dims": dims}
+    _dataset_index_cache[images_path] = index
+    return index
+
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...); C4/C8/CC are not frames
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def read_image_size(path):
+    """
+    Read (width, height) from a PNG or JPEG header without decoding the image.
+    Returns None for other formats or headers it can't parse.
+    """
+    with open(path, "rb") as f:
+        head = f.read(24)
+        if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:2] != b"\xff\xd8":
+            return None
+        
+        # Walk the JPEG segments up to the first frame header
+        f.seek(2)
+        while True:
+            byte = f.read(1)
+            if byte != b"\xff":
+                return None
+            marker = 0xFF
+            while marker == 0xFF:  # Skip fill bytes
+                byte = f.read(1)
+                if not byte:
+                    return None
+                marker = byte[0]
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                continue  # Markers without a length field
+            
+            segment = f.read(2)
+            if len(segment) < 2:
+                return None
+            length = struct.unpack(">H", segment)[0]
+            if marker in _JPEG_SOF_MARKERS:
+                frame = f.read(5)
+                if len(frame) < 5:
+                    return None
+                height, width = struct.unpack(">xHH", frame)
+                return width, height
+            f.seek(length - 2, os.SEEK_CUR)
+
+def get_dataset_image_details(index: dict, images_path: Path, img_name: str):
+    """Return (width, height, file_size) of a dataset image, reading its header only if it changed"""
+    img_path = images_path / img_name
+    st = img_path.stat()
+    cached = index["dims"].get(img_name)
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        return cached[1], cached[2], st.st_size
+    
+    size = read_image_size(img_path)
+    if size is None:
+        # Other formats (BMP, TIFF) or unusual headers go through PIL
+        from PIL import Image
+        with Image.open(img_path) as img:
+            size = img.size
+    width, height = size
+    index["dims"][img_name] = (st.st_mtime_ns, width, height)
+    return width, height, st.st_size
+
 def get_dataset_info_generic(dataset_type: str):
     """Get dataset information including total count of images"""
     try:
         dataset_path = get_dataset_path(dataset_type)
-        images_path = os.path.join(dataset_path, "images")
+        images_path = dataset_path / "images"
         
-        if not os.path.exists(images_path):
+        try:
+            index = get_dataset_index(images_path)
+        except FileNotFoundError:
             return {"total_images": 0, "dataset_exists": False}
         
         # Count total images
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
-        total_images = sum(1 for f in os.listdir(images_path) 
-                          if os.path.splitext(f.lower())[1] in image_extensions)
+        total_images = len(index["images"])
         
         return {
             "total_images": total_images,
             "dataset_exists": True,
-            "dataset_path": dataset_path
+            "dataset_path": str(dataset_path)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get {dataset_type} dataset info: {str(e)}")
@@ -1045,17 +1821,14 @@ def get_dataset_info_generic(dataset_type: str):
 def get_dataset_images_generic(dataset_type: str, page: int = 1, page_size: int = 25):
     """Get paginated list of dataset images"""
     try:
-        dataset_path = get_dataset_path(dataset_type)
-        images_path = os.path.join(dataset_path, "images")
+        images_path = get_dataset_path(dataset_type) / "images"
         
-        if not os.path.exists(images_path):
+        # Get all image files (sorted alphabetically)
+        try:
+            index = get_dataset_index(images_path)
+        except FileNotFoundError:
             return {"images": [], "total": 0, "page": page, "page_size": page_size, "total_pages": 0}
-        
-        # Get all image files
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
-        all_images = [f for f in os.listdir(images_path) 
-                     if os.path.splitext(f.lower())[1] in image_extensions]
-        all_images.sort()  # Sort alphabetically
+        all_images = index["images"]
         
         total_images = len(all_images)
         total_pages = (total_images + page_size - 1) // page_size
@@ -1068,11 +1841,8 @@ def get_dataset_images_generic(dataset_type: str, page: int = 1, page_size: int
         # Get image details
         images_data = []
         for img_name in page_images:
-            img_path = os.path.join(images_path, img_name)
             try:
-                with Image.open(img_path) as img:
-                    width, height = img.size
-                file_size = os.path.getsize(img_path)
+                width, height, file_size = get_dataset_image_details(index, images_path, img_name)
                 
                 images_data.append({
                     "name": img_name,
@@ -1095,92 +1865,101 @@ def get_dataset_images_generic(dataset_type: str, page: int = 1, page_size: int
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get {dataset_type} dataset images: {str(e)}")
 
-def get_dataset_image_generic(dataset_type: str, image_name: str):
-    """Get a specific dataset image file"""
+# Dataset images only change by being regenerated, which changes their mtime and ETag
+DATASET_IMAGE_CACHE_CONTROL = "public, max-age=3600"
+
+def get_dataset_image_generic(dataset_type: str, image_name: str, if_none_match: str = None):
+    """Get a specific dataset image file, answering 304 when the client's copy is current"""
     try:
-        dataset_path = get_dataset_path(dataset_type)
-        images_path = os.path.join(dataset_path, "images")
-        image_path = os.path.join(images_path, image_name)
+        image_path = get_dataset_path(dataset_type) / "images" / image_name
         
-        if not os.path.exists(image_path):
+        try:
+            st = image_path.stat()
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Image not found")
         
-        return FileResponse(image_path, media_type="image/jpeg")
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        headers = {"ETag": etag, "Cache-Control": DATASET_IMAGE_CACHE_CONTROL}
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            return Response(status_code=304, headers=headers)
+        
+        return FileResponse(image_path, media_type="image/jpeg", headers=headers, stat_result=st)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get {dataset_type} dataset image: {str(e)}")
 
 def get_dataset_image_with_boxes_generic(dataset_type: str, image_name: str):
     """Get a dataset image with bounding boxes drawn on it"""
+    import warnings
+    import cv2
+    import numpy as np
+    
     try:
         dataset_path = get_dataset_path(dataset_type)
-        images_path = os.path.join(dataset_path, "images")
-        labels_path = os.path.join(dataset_path, "labels")
-        
-        image_path = os.path.join(images_path, image_name)
-        label_name = os.path.splitext(image_name)[0] + ".txt"
-        label_path = os.path.join(labels_path, label_name)
+        image_path = dataset_path / "images" / image_name
+        label_name = Path(image_name).stem + ".txt"
+        label_path = dataset_path / "labels" / label_name
         
-        if not os.path.exists(image_path):
+        if not image_path.is_file():
             raise HTTPException(status_code=404, detail="Image not found")
         
         # Load the image
-        image = cv2.imread(image_path)
+        image = cv2.imread(str(image_path))
         if image is None:
             raise HTTPException(status_code=500, detail="Failed to load image")
         
         height, width = image.shape[:2]
         
-        # Draw bounding boxes if label file exists
-        if os.path.exists(label_path):
-            with open(label_path, 'r') as f:
-                lines = f.readlines()
+        # Read the boxes; images without a label file have none
+        try:
+            with warnings.catch_warnings():
+                # Empty label files (images without targets) are expected
+                warnings.simplefilter("ignore", UserWarning)
+                labels = np.loadtxt(label_path, ndmin=2, usecols=range(5))
+        except FileNotFoundError:
+            labels = np.empty((0, 5))
+        except ValueError as e:
+            print(f"Malformed label file {label_name}: {e}")
+            labels = np.empty((0, 5))
+        
+        if labels.size:
+            class_ids = labels[:, 0].astype(np.int32)
             
-            for line in lines:
-                line = line.strip()
-                if line:
-                    parts = line.split()
-                    if len(parts) >= 5:
-                        class_id = int(parts[0])
-                        x_center = float(parts[1])
-                        y_center = float(parts[2])
-                        box_width = float(parts[3])
-                        box_height = float(parts[4])
-                        
-                        # Convert normalized coordinates to pixel coordinates
-                        x_center_px = int(x_center * width)
-                        y_center_px = int(y_center * height)
-                        box_width_px = int(box_width * width)
-                        box_height_px = int(box_height * height)
-                        
-                        # Calculate top-left and bottom-right corners
-                        x1 = int(x_center_px - box_width_px // 2)
-                        y1 = int(y_center_px - box_height_px // 2)
-                        x2 = int(x_center_px + box_width_px // 2)
-                        y2 = int(y_center_px + box_height_px // 2)
-                        
-                        # Draw rectangle (red color for class 0, other colors for other classes)
-                        color = (0, 0, 255) if class_id == 0 else (0, 255, 0)  # BGR format
-                        cv2.rectangle(image, (x1, y1), (x2, y2), color, 1)
-                        
-                        # Add styled class label with background
-                        label = f"Class {class_id}"
-                        label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)[0]
-                        cv2.rectangle(image, (x1, y1 - label_size[1] - 10), 
-                                    (x1 + label_size[0], y1), color, -1)
-                        cv2.putText(image, label, (x1, y1 - 5), 
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
-
-        # Convert to RGB for PIL
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        pil_image = Image.fromarray(image_rgb)
-        
-        # Save to memory buffer
-        img_buffer = io.BytesIO()
-        pil_image.save(img_buffer, format="JPEG", quality=95)
-        img_buffer.seek(0)
+            # Convert normalized coordinates to pixel coordinates for all boxes at once
+            x_centers_px = (labels[:, 1] * width).astype(np.int32)
+            y_centers_px = (labels[:, 2] * height).astype(np.int32)
+            half_widths_px = (labels[:, 3] * width).astype(np.int32) // 2
+            half_heights_px = (labels[:, 4] * height).astype(np.int32) // 2
+            
+            # Calculate top-left and bottom-right corners
+            corners = np.stack([
+                x_centers_px - half_widths_px,
+                y_centers_px - half_heights_px,
+                x_centers_px + half_widths_px,
+                y_centers_px + half_heights_px
+            ], axis=1)
+            
+            for class_id, (x1, y1, x2, y2) in zip(class_ids.tolist(), corners.tolist()):
+                # Draw rectangle (red color for class 0, other colors for other classes)
+                color = (0, 0, 255) if class_id == 0 else (0, 255, 0)  # BGR format
+                cv2.rectangle(image, (x1, y1), (x2, y2), color, 1)
+                
+                # Add styled class label with background
+                label = f"Class {class_id}"
+                label_w, label_h = get_label_size(label, 0.4, 1)
+                cv2.rectangle(image, (x1, y1 - label_h - 10), 
+                            (x1 + label_w, y1), color, -1)
+                cv2.putText(image, label, (x1, y1 - 5), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+
+        # Encode to JPEG in memory
+        ok, jpeg = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), 95])
+        if not ok:
+            raise HTTPException(status_code=500, detail="Failed to encode image")
         
         # Return as response
-        return StreamingResponse(img_buffer, media_type="image/jpeg")
+        return Response(content=jpeg.tobytes(), media_type="image/jpeg")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get {dataset_type} dataset image with boxes: {str(e)}")
@@ -1188,18 +1967,15 @@ def get_dataset_image_with_boxes_generic(dataset_type: str, image_name: str):
 def get_dataset_image_labels_generic(dataset_type: str, image_name: str):
     """Get label data for a specific dataset image"""
     try:
-        dataset_path = get_dataset_path(dataset_type)
-        labels_path = os.path.join(dataset_path, "labels")
+        label_path = get_dataset_path(dataset_type) / "labels" / (Path(image_name).stem + ".txt")
         
-        label_name = os.path.splitext(image_name)[0] + ".txt"
-        label_path = os.path.join(labels_path, label_name)
-        
-        if not os.path.exists(label_path):
+        try:
+            with open(label_path, 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
             return []  # No labels found
         
         labels = []
-        with open(label_path, 'r') as f:
-            lines = f.readlines()
         
         for line in lines:
             line = line.strip()
@@ -1223,26 +1999,27 @@ def delete_dataset_image_generic(dataset_type: str, image_name: str):
     """Delete a specific dataset image and its corresponding label"""
     try:
         dataset_path = get_dataset_path(dataset_type)
-        images_path = os.path.join(dataset_path, "images")
-        labels_path = os.path.join(dataset_path, "labels")
-        
-        image_path = os.path.join(images_path, image_name)
+        image_path = dataset_path / "images" / image_name
         
         # Get corresponding label file (same name but .txt extension)
-        base_name = os.path.splitext(image_name)[0]
-        label_path = os.path.join(labels_path, f"{base_name}.txt")
+        base_name = Path(image_name).stem
+        label_path = dataset_path / "labels" / f"{base_name}.txt"
         
         deleted_files = []
         
         # Delete image file
-        if os.path.exists(image_path):
-            os.remove(image_path)
+        try:
+            image_path.unlink()
             deleted_files.append(f"images/{image_name}")
+        except FileNotFoundError:
+            pass
         
         # Delete corresponding label file
-        if os.path.exists(label_path):
-            os.remove(label_path)
+        try:
+            label_path.unlink()
             deleted_files.append(f"labels/{base_name}.txt")
+        except FileNotFoundError:
+            pass
         
         if not deleted_files:
             raise HTTPException(status_code=404, detail="Image not found")
@@ -1255,6 +2032,66 @@ def delete_dataset_image_generic(dataset_type: str, image_name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete {dataset_type} dataset image: {str(e)}")
 
+def open_dataset_dir(path: Path):
+    """Open a dataset directory for *at() calls, or return None when it doesn't exist"""
+    try:
+        return os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except FileNotFoundError:
+        return None
+
+def delete_dataset_images_generic(dataset_type: str, image_names: list):
+    """Delete several dataset images and their labels, resolving each directory only once"""
+    try:
+        dataset_path = get_dataset_path(dataset_type)
+        
+        # Security check - names are unlinked relative to the directories, so no path components
+        for image_name in image_names:
+            if not image_name or image_name in (".", "..") or "/" in image_name or "\\" in image_name:
+                raise HTTPException(status_code=400, detail=f"Invalid image name: {image_name}")
+        
+        images_fd = open_dataset_dir(dataset_path / "images")
+        labels_fd = open_dataset_dir(dataset_path / "labels")
+        deleted_files = []
+        not_found = []
+        try:
+            for image_name in image_names:
+                found = False
+                if images_fd is not None:
+                    try:
+                        os.unlink(image_name, dir_fd=images_fd)
+                        deleted_files.append(f"images/{image_name}")
+                        found = True
+                    except FileNotFoundError:
+                        pass
+                
+                label_name = Path(image_name).stem + ".txt"
+                if labels_fd is not None:
+                    try:
+                        os.unlink(label_name, dir_fd=labels_fd)
+                        deleted_files.append(f"labels/{label_name}")
+                        found = True
+                    except FileNotFoundError:
+                        pass
+                
+                if not found:
+                    not_found.append(image_name)
+        finally:
+            for fd in (images_fd, labels_fd):
+                if fd is not None:
+                    os.close(fd)
+        
+        # The dataset index is keyed on the images directory mtime, so it is rebuilt on the next listing
+        return {
+            "status": "success",
+            "deleted_files": deleted_files,
+            "not_found": not_found,
+            "message": f"Successfully deleted {len(image_names) - len(not_found)} images and their labels from {dataset_type} dataset"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete {dataset_type} dataset images: {str(e)}")
+
 # Dataset API endpoints using generic methods
 @app.get("/api/dataset/synthetic/info")
 async def get_dataset_info():
@@ -1267,9 +2104,9 @@ async def get_dataset_images(page: int = 1, page_size: int = 25):
     return get_dataset_images_generic("synthetic", page, page_size)
 
 @app.get("/api/dataset/synthetic/image/{image_name}")
-async def get_dataset_image(image_name: str):
+async def get_dataset_image(image_name: str, if_none_match: str = Header(None)):
     """Get a specific synthetic dataset image file"""
-    return get_dataset_image_generic("synthetic", image_name)
+    return get_dataset_image_generic("synthetic", image_name, if_none_match)
 
 @app.get("/api/dataset/synthetic/image/{image_name}/with-boxes")
 async def get_dataset_image_with_boxes(image_name: str):
@@ -1286,25 +2123,29 @@ async def delete_dataset_image(image_name: str):
     """Delete a specific synthetic dataset image and its corresponding label"""
     return delete_dataset_image_generic("synthetic", image_name)
 
+@app.delete("/api/dataset/synthetic/images")
+async def delete_dataset_images(req: DeleteDatasetImagesRequest):
+    """Delete several synthetic dataset images and their labels in one request"""
+    return await asyncio.to_thread(delete_dataset_images_generic, "synthetic", req.names)
+
 # Custom Dataset API Endpoints
 
 @app.get("/api/dataset/custom/backgrounds")
 async def get_custom_backgrounds():
     """Get list of custom background images"""
     try:
-        backgrounds_path = "/app/training_scripts/data/backgrounds"
+        backgrounds_path = BACKGROUNDS_ROOT
         
         if not os.path.exists(backgrounds_path):
             return {"backgrounds": []}
         
         backgrounds = []
-        for filename in os.listdir(backgrounds_path):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-                file_path = os.path.join(backgrounds_path, filename)
-                if os.path.isfile(file_path):
-                    stat = os.stat(file_path)
+        with os.scandir(backgrounds_path) as it:
+            for entry in it:
+                if entry.name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')) and entry.is_file():
+                    stat = entry.stat()
                     backgrounds.append({
-                        "filename": filename,
+                        "filename": entry.name,
                         "size": stat.st_size,
                         "created": datetime.datetime.fromtimestamp(stat.st_ctime).isoformat()
                     })
@@ -1320,19 +2161,18 @@ async def get_custom_backgrounds():
 async def get_custom_targets():
     """Get list of custom target images"""
     try:
-        targets_path = "/app/training_scripts/data/cursors"
+        targets_path = TARGETS_ROOT
         
         if not os.path.exists(targets_path):
             return {"targets": []}
         
         targets = []
-        for filename in os.listdir(targets_path):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-                file_path = os.path.join(targets_path, filename)
-                if os.path.isfile(file_path):
-                    stat = os.stat(file_path)
+        with os.scandir(targets_path) as it:
+            for entry in it:
+                if entry.name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')) and entry.is_file():
+                    stat = entry.stat()
                     targets.append({
-                        "filename": filename,
+                        "filename": entry.name,
                         "size": stat.st_size,
                         "created": datetime.datetime.fromtimestamp(stat.st_ctime).isoformat()
                     })
@@ -1348,7 +2188,7 @@ async def get_custom_targets():
 async def get_custom_background_image(filename: str):
     """Serve a custom background image"""
     try:
-        backgrounds_path = "/app/training_scripts/data/backgrounds"
+        backgrounds_path = BACKGROUNDS_ROOT
         file_path = os.path.join(backgrounds_path, filename)
         
         if not os.path.exists(file_path):
@@ -1368,7 +2208,7 @@ async def get_custom_background_image(filename: str):
 async def get_custom_target_image(filename: str):
     """Serve a custom target image"""
     try:
-        targets_path = "/app/training_scripts/data/cursors"
+        targets_path = TARGETS_ROOT
         file_path = os.path.join(targets_path, filename)
         
         if not os.path.exists(file_path):
@@ -1388,7 +2228,7 @@ async def get_custom_target_image(filename: str):
 async def delete_custom_background(filename: str):
     """Delete a custom background image"""
     try:
-        backgrounds_path = "/app/training_scripts/data/backgrounds"
+        backgrounds_path = BACKGROUNDS_ROOT
         file_path = os.path.join(backgrounds_path, filename)
         
         # Security check - ensure filename doesn't contain path traversal
@@ -1413,7 +2253,7 @@ async def delete_custom_background(filename: str):
 async def delete_custom_target(filename: str):
     """Delete a custom target image"""
     try:
-        targets_path = "/app/training_scripts/data/cursors"
+        targets_path = TARGETS_ROOT
         file_path = os.path.join(targets_path, filename)
         
         # Security check - ensure filename doesn't contain path traversal
@@ -1437,10 +2277,12 @@ async def delete_custom_target(filename: str):
 @app.post("/api/dataset/custom/generate")
 async def generate_custom_dataset(request: GenerateDatasetRequest):
     """Generate synthetic dataset using selected target and background"""
+    from PIL import Image
+    
     try:
-        backgrounds_path = "/app/training_scripts/data/backgrounds"
-        targets_path = "/app/training_scripts/data/cursors"
-        output_dir = "/app/training_scripts/data/custom_dataset"
+        backgrounds_path = BACKGROUNDS_ROOT
+        targets_path = TARGETS_ROOT
+        output_dir = get_dataset_path("custom")
         
         # Validate input files exist
         background_file = os.path.join(backgrounds_path, request.background_filename)
@@ -1464,16 +2306,25 @@ async def generate_custom_dataset(request: GenerateDatasetRequest):
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Load the single background and target images
-        background = Image.open(background_file).convert("RGBA")
+        background = Image.open(background_file).convert("RGB")
         target = Image.open(target_file).convert("RGBA")
         
         img_size = (request.width, request.height)
         
+        # Resize the background once; each image only scales the small target by the same
+        # factor and pastes it at the scaled position, instead of resizing the whole
+        # composited background per image
+        bg_w, bg_h = background.size
+        resized_background, scale, _ = resize_with_aspect_ratio(background, img_size, 'pad')
+        resized_background = resized_background.convert("RGB")  # Pad canvas is RGBA
+        pad_x = (img_size[0] - int(bg_w * scale)) // 2
+        pad_y = (img_size[1] - int(bg_h * scale)) // 2
+        
+        # Scaled target per height; there are only 21 possible heights
+        scaled_targets = {}
+        
         # Generate the specified number of images
         for i in range(request.num_images):
-            # Create a copy of the background for this iteration
-            bg_copy = background.copy()
-            
             # Define a realistic, small size for the target (20-40px height)
             new_target_h = random.randint(20, 40)
             target_w, target_h = target.size
@@ -1483,11 +2334,7 @@ async def generate_custom_dataset(request: GenerateDatasetRequest):
             else:
                 new_target_w = 20
             
-            # Resize the target to its small, realistic size
-            target_resized = target.resize((new_target_w, new_target_h), Image.LANCZOS)
-            
             # Place the small target on the full-size background
-            bg_w, bg_h = bg_copy.size
             max_x = bg_w - new_target_w
             max_y = bg_h - new_target_h
             
@@ -1499,34 +2346,30 @@ async def generate_custom_dataset(request: GenerateDatasetRequest):
                 paste_x = random.randint(0, max_x)
                 paste_y = random.randint(0, max_y)
             
-            # Paste target onto background using alpha channel as mask
-            bg_copy.paste(target_resized, (paste_x, paste_y), target_resized)
+            # Resize the target by the background's scale
+            target_resized = scaled_targets.get(new_target_h)
+            if target_resized is None:
+                target_resized = scaled_targets[new_target_h] = target.resize(
+                    (max(1, round(new_target_w * scale)), max(1, round(new_target_h * scale))), Image.LANCZOS
+                )
             
-            # Resize maintaining aspect ratio with padding
-            final_image, scale_x, scale_y = resize_with_aspect_ratio(bg_copy, img_size, 'pad')
-            
-            # Convert to RGB for saving as JPEG
-            final_image_rgb = final_image.convert("RGB")
+            # Paste target onto a copy of the resized background using alpha channel as mask
+            final_image_rgb = resized_background.copy()
+            final_image_rgb.paste(
+                target_resized,
+                (round(paste_x * scale) + pad_x, round(paste_y * scale) + pad_y),
+                target_resized
+            )
             
             # Save image with timestamp
             img_filename = f"custom_{timestamp}_{i:04d}.jpg"
             final_image_rgb.save(os.path.join(images_out_dir, img_filename))
             
-            # Calculate YOLO label coordinates
-            final_x = paste_x * scale_x
-            final_y = paste_y * scale_y
-            final_w = new_target_w * scale_x
-            final_h = new_target_h * scale_y
-            
-            # Account for padding offset when using 'pad' method
-            if scale_x == scale_y:  # pad method
-                actual_scaled_w = bg_w * scale_x
-                actual_scaled_h = bg_h * scale_y
-                pad_x = (img_size[0] - actual_scaled_w) / 2
-                pad_y = (img_size[1] - actual_scaled_h) / 2
-                
-                final_x += pad_x
-                final_y += pad_y
+            # Calculate YOLO label coordinates, offset by the padding
+            final_x = paste_x * scale + pad_x
+            final_y = paste_y * scale + pad_y
+            final_w = new_target_w * scale
+            final_h = new_target_h * scale
             
             # Calculate center coordinates and normalize
             x_center = final_x + final_w / 2
@@ -1552,7 +2395,7 @@ async def generate_custom_dataset(request: GenerateDatasetRequest):
                 "target_image": request.target_filename,
                 "background_image": request.background_filename,
                 "output_size": f"{request.width}x{request.height}",
-                "output_directory": output_dir
+                "output_directory": str(output_dir)
             }
         }
         
@@ -1574,9 +2417,9 @@ async def get_custom_dataset_images(page: int = 1, page_size: int = 25):
     return get_dataset_images_generic("custom", page, page_size)
 
 @app.get("/api/dataset/custom/image/{image_name}")
-async def get_custom_dataset_image(image_name: str):
+async def get_custom_dataset_image(image_name: str, if_none_match: str = Header(None)):
     """Get a specific custom dataset image file"""
-    return get_dataset_image_generic("custom", image_name)
+    return get_dataset_image_generic("custom", image_name, if_none_match)
 
 @app.get("/api/dataset/custom/image/{image_name}/with-boxes")
 async def get_custom_dataset_image_with_boxes(image_name: str):
@@ -1593,6 +2436,11 @@ async def delete_custom_dataset_image(image_name: str):
     """Delete a specific custom dataset image and its corresponding label"""
     return delete_dataset_image_generic("custom", image_name)
 
+@app.delete("/api/dataset/custom/images")
+async def delete_custom_dataset_images(req: DeleteDatasetImagesRequest):
+    """Delete several custom dataset images and their labels in one request"""
+    return await asyncio.to_thread(delete_dataset_images_generic, "custom", req.names)
+
 @app.post("/api/dataset/custom/upload/target")
 async def upload_target_file(file: UploadFile = File(...)):
     """Upload a target image file for custom dataset generation"""
@@ -1602,7 +2450,7 @@ async def upload_target_file(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="File must be an image")
         
         # Create target directory if it doesn't exist
-        targets_path = "/app/training_scripts/data/cursors"
+        targets_path = TARGETS_ROOT
         os.makedirs(targets_path, exist_ok=True)
         
         # Generate a unique filename with timestamp
@@ -1637,7 +2485,7 @@ async def upload_background_file(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="File must be an image")
         
         # Create background directory if it doesn't exist
-        backgrounds_path = "/app/training_scripts/data/backgrounds"
+        backgrounds_path = BACKGROUNDS_ROOT
         os.makedirs(backgrounds_path, exist_ok=True)
         
         # Generate a unique filename with timestamp
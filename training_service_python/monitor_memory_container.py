@@ -7,14 +7,95 @@ import time
 import os
 from datetime import datetime
 
-def get_container_memory_info():
-    """Get memory information from inside the container"""
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+# (usage, limit) files of the container's memory cgroup
+CGROUP_MEMORY_FILES = [
+    ('/sys/fs/cgroup/memory/memory.usage_in_bytes', '/sys/fs/cgroup/memory/memory.limit_in_bytes'),  # cgroup v1
+    ('/sys/fs/cgroup/memory.current', '/sys/fs/cgroup/memory.max'),  # cgroup v2
+]
+
+# Cgroup files are opened once and re-read in place on every sample
+_cgroup_fds = None
+
+def open_cgroup_memory_files():
+    """Open the first available pair of cgroup memory files, returning (usage_fd, limit_fd)"""
+    for usage_path, limit_path in CGROUP_MEMORY_FILES:
+        try:
+            usage_fd = os.open(usage_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            limit_fd = os.open(limit_path, os.O_RDONLY)
+        except OSError:
+            os.close(usage_fd)
+            continue
+        return usage_fd, limit_fd
+    raise OSError('No cgroup memory files found')
+
+def read_cgroup_value(fd):
+    """Read an integer cgroup value from the start of an open file"""
+    value = os.pread(fd, 64, 0).strip()
+    if value == b'max':
+        # cgroup v2 reports no limit as "max"; the host memory is the effective limit
+        return psutil.virtual_memory().total
+    return int(value)
+
+# Last process scan, reused by get_container_memory_info while it is recent enough
+_process_scan = {'timestamp': 0.0, 'python_processes': [], 'training_processes': []}
+
+def scan_python_processes():
+    """Find Python processes by reading /proc directly (comm, then statm and cmdline for matches)"""
+    python_processes = []
+    training_processes = []
+    
+    with os.scandir('/proc') as it:
+        for entry in it:
+            if not entry.name.isdigit():
+                continue
+            
+            try:
+                with open(f'{entry.path}/comm', 'r') as f:
+                    name = f.read().strip()
+                if 'python' not in name.lower():
+                    continue
+                
+                with open(f'{entry.path}/statm', 'rb') as f:
+                    memory_mb = int(f.read().split()[1]) * PAGE_SIZE / 1024 / 1024
+                with open(f'{entry.path}/cmdline', 'rb') as f:
+                    cmdline = f.read().decode('utf-8', errors='replace').rstrip('\0').replace('\0', ' ')
+            except (OSError, ValueError, IndexError):
+                # Process exited or isn't readable
+                continue
+            
+            proc_info = {
+                'pid': int(entry.name),
+                'name': name,
+                'memory_mb': round(memory_mb, 2),
+                'cmdline': cmdline[:100] + '...' if len(cmdline) > 100 else cmdline
+            }
+            python_processes.append(proc_info)
+            
+            # Check if it's a training process
+            if any(keyword in cmdline.lower() for keyword in ['train', 'yolo', 'ultralytics']):
+                training_processes.append(proc_info)
+    
+    return python_processes, training_processes
+
+def get_container_memory_info(process_max_age=0):
+    """
+    Get memory information from inside the container.
+    The process list is rescanned only when the last scan is older than process_max_age seconds.
+    """
+    global _cgroup_fds
+    
     # Container memory from cgroup
     try:
-        with open('/sys/fs/cgroup/memory/memory.usage_in_bytes', 'r') as f:
-            usage_bytes = int(f.read().strip())
-        with open('/sys/fs/cgroup/memory/memory.limit_in_bytes', 'r') as f:
-            limit_bytes = int(f.read().strip())
+        if _cgroup_fds is None:
+            _cgroup_fds = open_cgroup_memory_files()
+        usage_fd, limit_fd = _cgroup_fds
+        usage_bytes = read_cgroup_value(usage_fd)
+        limit_bytes = read_cgroup_value(limit_fd)
         
         # Convert to MB/GB
         usage_mb = usage_bytes / 1024 / 1024
@@ -36,30 +117,13 @@ def get_container_memory_info():
     mem = psutil.virtual_memory()
     
     # Find Python processes
-    python_processes = []
-    training_processes = []
-    
-    for proc in psutil.process_iter(['pid', 'name', 'memory_info', 'memory_percent', 'cmdline']):
-        try:
-            cmdline = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-            memory_mb = proc.info['memory_info'].rss / 1024 / 1024
-            
-            if 'python' in proc.info['name'].lower():
-                proc_info = {
-                    'pid': proc.info['pid'],
-                    'name': proc.info['name'],
-                    'memory_mb': round(memory_mb, 2),
-                    'memory_percent': round(proc.info['memory_percent'], 2),
-                    'cmdline': cmdline[:100] + '...' if len(cmdline) > 100 else cmdline
-                }
-                python_processes.append(proc_info)
-                
-                # Check if it's a training process
-                if any(keyword in cmdline.lower() for keyword in ['train', 'yolo', 'ultralytics']):
-                    training_processes.append(proc_info)
-                    
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
+    now = time.monotonic()
+    if now - _process_scan['timestamp'] >= process_max_age:
+        python_processes, training_processes = scan_python_processes()
+        _process_scan.update(timestamp=now, python_processes=python_processes,
+                             training_processes=training_processes)
+    python_processes = _process_scan['python_processes']
+    training_processes = _process_scan['training_processes']
     
     return {
         'timestamp': datetime.now().isoformat(),
@@ -83,7 +147,8 @@ def monitor_memory_simple(interval=3):
     
     try:
         while True:
-            info = get_container_memory_info()
+            # Processes change much less often than memory usage, rescan every other sample
+            info = get_container_memory_info(process_max_age=interval * 2)
             
             # Container memory usage
             if 'error' not in info['cgroup_memory']:
@@ -121,7 +186,7 @@ def monitor_memory_detailed():
     """Detailed memory monitoring"""
     while True:
         try:
-            info = get_container_memory_info()
+            info = get_container_memory_info(process_max_age=10)
             print(f"\n=== {info['timestamp']} ===")
             
             if 'error' not in info['cgroup_memory']:
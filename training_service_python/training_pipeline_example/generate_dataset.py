@@ -5,36 +5,90 @@ This script demonstrates synthetic data generation with realistic output.
 """
 
 import argparse
+import os
 import time
 import random
 import sys
 from pathlib import Path
 
+import numpy as np
+
+# SIM_FAST=1 skips the simulated processing delays (test_scripts.py sets it)
+_SLEEP_SCALE = 0.0 if os.environ.get("SIM_FAST") else 1.0
+
+def _sleep(seconds):
+    """Simulate processing time, skipped entirely in SIM_FAST mode"""
+    if _SLEEP_SCALE:
+        time.sleep(seconds * _SLEEP_SCALE)
+
+_RULE = "=" * 60
+
 def print_banner(title):
     """Print a styled banner for script sections"""
-    print("=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
+    print(f"{_RULE}\n  {title}\n{_RULE}")
+
+PROGRESS_BAR_WIDTH = 50
+_BAR_FULL = "█" * PROGRESS_BAR_WIDTH
+_BAR_EMPTY = "░" * PROGRESS_BAR_WIDTH
 
-def print_progress_bar(current, total, width=50):
-    """Print a progress bar"""
+# (total, filled) of the last bar drawn, so updates that don't move the bar are skipped
+_last_progress = None
+
+# On a terminal the bar is written straight to fd 1 from pre-encoded prefixes keyed by
+# (filled, width); piped output keeps going through sys.stdout so it stays ordered
+# with the script's other prints
+_STDOUT_IS_TTY = sys.stdout.isatty()
+_BAR_CACHE = {}
+
+def print_progress_bar(current, total, width=PROGRESS_BAR_WIDTH):
+    """Print a progress bar, redrawing it only when the filled part changes"""
+    global _last_progress
+    
     progress = current / total
     filled = int(width * progress)
-    bar = "█" * filled + "░" * (width - filled)
+    if (total, filled) == _last_progress and current != total:
+        return
+    _last_progress = (total, filled)
+    
     percentage = progress * 100
-    print(f"\r  Progress: |{bar}| {percentage:.1f}% ({current}/{total})", end="", flush=True)
+    if _STDOUT_IS_TTY:
+        prefix = _BAR_CACHE.get((filled, width))
+        if prefix is None:
+            bar = _BAR_FULL[:filled] + _BAR_EMPTY[:width - filled]
+            prefix = _BAR_CACHE[(filled, width)] = f"\r  Progress: |{bar}| ".encode()
+        os.write(1, prefix + f"{percentage:.1f}% ({current}/{total})".encode())
+        return
+    
+    bar = _BAR_FULL[:filled] + _BAR_EMPTY[:width - filled]
+    sys.stdout.write(f"\r  Progress: |{bar}| {percentage:.1f}% ({current}/{total})")
+    sys.stdout.flush()
+
+# Generation techniques reported for sampled images in verbose mode
+_TECHNIQUES = (
+    "Background replacement",
+    "Object augmentation",
+    "Lighting variation",
+    "Perspective transformation",
+    "Color space adjustment",
+    "Texture synthesis"
+)
 
-def generate_synthetic_images(num_images, verbose=False):
+def generate_synthetic_images(num_images, verbose=False, seed=None):
     """Simulate synthetic image generation"""
     print_banner("SYNTHETIC DATASET GENERATION")
     
+    # Per-image random draws are made up front in bulk rather than one call per image
+    rng = np.random.default_rng(seed)
+    show_details = rng.random(num_images) < 0.1  # Show details for ~10% of images
+    technique_idx = rng.integers(0, len(_TECHNIQUES), num_images)
+    
     print(f"🎯 Target: Generate {num_images} synthetic images")
     print(f"🎨 Method: Advanced data augmentation + GAN synthesis")
     print()
     
     # Simulate initialization
     print("🔧 Initializing generators...")
-    time.sleep(1)
+    _sleep(1)
     print("  ✓ Background generator loaded")
     print("  ✓ Object placement engine ready")
     print("  ✓ Lighting simulation initialized")
@@ -42,13 +96,17 @@ def generate_synthetic_images(num_images, verbose=False):
     
     # Simulate generation process
     print(f"\n🏭 Generating {num_images} synthetic images...")
-    time.sleep(1)
+    _sleep(1)
     
     batch_size = min(50, max(10, num_images // 10))
     batches = (num_images + batch_size - 1) // batch_size
     
     generated_count = 0
     
+    # The bar has at most a few hundred visible states, so only update it every
+    # progress_every images (at least every 10 in verbose mode, as before)
+    progress_every = max(10 if verbose else 1, num_images // 200)
+    
     for batch in range(batches):
         batch_start = batch * batch_size
         batch_end = min((batch + 1) * batch_size, num_images)
@@ -62,40 +120,31 @@ def generate_synthetic_images(num_images, verbose=False):
             generated_count += 1
             
             # Simulate different generation techniques
-            techniques = [
-                "Background replacement",
-                "Object augmentation", 
-                "Lighting variation",
-                "Perspective transformation",
-                "Color space adjustment",
-                "Texture synthesis"
-            ]
-            
-            if verbose and random.random() < 0.1:  # Show details for ~10% of images
-                technique = random.choice(techniques)
+            if verbose and show_details[generated_count - 1]:
+                technique = _TECHNIQUES[technique_idx[generated_count - 1]]
                 print(f"    🎨 Image {generated_count}: {technique}")
             
             # Update progress bar
-            if not verbose or generated_count % 10 == 0:
+            if generated_count % progress_every == 0 or generated_count == num_images:
                 print_progress_bar(generated_count, num_images)
-            
-            # Simulate processing time
-            time.sleep(0.02 if verbose else 0.01)
+        
+        # Simulate processing time for the whole batch with one sleep
+        _sleep(batch_count * (0.02 if verbose else 0.01))
     
     print()  # New line after progress bar
     
     # Simulate annotation generation
     print(f"\n📝 Generating annotations for {num_images} images...")
-    time.sleep(1)
+    _sleep(1)
     
     annotation_types = ["bounding_boxes", "class_labels", "confidence_scores"]
     for ann_type in annotation_types:
         print(f"  ✓ Generated {ann_type}")
-        time.sleep(0.5)
+    _sleep(len(annotation_types) * 0.5)
     
     # Simulate quality validation
     print("\n🔍 Validating generated dataset...")
-    time.sleep(1)
+    _sleep(1)
     
     valid_images = num_images - random.randint(0, max(1, num_images // 100))
     invalid_images = num_images - valid_images
@@ -103,7 +152,7 @@ def generate_synthetic_images(num_images, verbose=False):
     print(f"  ✓ Valid images: {valid_images}")
     if invalid_images > 0:
         print(f"  ⚠️  Invalid images: {invalid_images} (regenerating...)")
-        time.sleep(1)
+        _sleep(1)
         print(f"  ✓ Regenerated {invalid_images} images")
     
     # Simulate dataset statistics
@@ -118,10 +167,13 @@ def generate_synthetic_images(num_images, verbose=False):
     classes = ["person", "car", "truck", "bicycle", "motorcycle"]
     total_objects = int(num_images * random.uniform(2, 5))
     
-    for i, cls in enumerate(classes):
-        percentage = random.uniform(10, 30)
-        count = int(total_objects * percentage / 100)
-        print(f"  Class {i} ({cls}): {count} instances ({percentage:.1f}%)")
+    percentages = rng.uniform(10, 30, len(classes))
+    counts = (total_objects * percentages / 100).astype(int)
+    
+    sys.stdout.write("".join(
+        f"  Class {i} ({cls}): {counts[i]} instances ({percentages[i]:.1f}%)\n"
+        for i, cls in enumerate(classes)
+    ))
     
     print(f"\n✅ Synthetic dataset generation completed!")
     print(f"📁 Output: {num_images} images + annotations saved to ./synthetic_data/")
@@ -196,7 +248,7 @@ Examples:
             print("   Consider using smaller batches for better progress tracking")
         
         # Run generation
-        success = generate_synthetic_images(args.num_images, args.verbose)
+        success = generate_synthetic_images(args.num_images, args.verbose, args.seed)
         
         if success:
             print(f"\n🎉 Script completed successfully!")
@@ -3,43 +3,76 @@
 Test script to verify the example training pipeline scripts work correctly.
 """
 
+import os
 import subprocess
 import sys
-import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Only the end of each script's output is reported, so only that much is kept
+STDOUT_TAIL_LINES = 5
+STDERR_TAIL_LINES = 20
+
+def drain_stream(stream, tail):
+    """Read a child stream to EOF, keeping only its last lines"""
+    for line in stream:
+        tail.append(line.rstrip("\n"))
+    stream.close()
+
 def run_script_test(script_path, args=[], timeout=30):
-    """Run a script and capture its output"""
+    """Run a script and capture the tail of its output. Returns (passed, report lines)."""
+    report = []
     try:
-        cmd = [sys.executable, script_path] + args
-        print(f"🧪 Testing: {' '.join(cmd)}")
+        cmd = [sys.executable, str(script_path)] + args
+        report.append(f"🧪 Testing: {' '.join(cmd)}")
         
-        result = subprocess.run(
+        process = subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=timeout,
-            cwd=Path(script_path).parent
+            bufsize=1,
+            cwd=Path(script_path).parent,
+            env={**os.environ, "SIM_FAST": "1"}  # Skip the scripts' simulated delays
         )
+        stdout_tail = deque(maxlen=STDOUT_TAIL_LINES)
+        stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+        readers = [
+            threading.Thread(target=drain_stream, args=(process.stdout, stdout_tail), daemon=True),
+            threading.Thread(target=drain_stream, args=(process.stderr, stderr_tail), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+        
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            report.append(f"⏰ Script timed out after {timeout}s")
+            return False, report
+        finally:
+            for reader in readers:
+                reader.join()
         
-        if result.returncode == 0:
-            print(f"✅ Script passed")
+        if returncode == 0:
+            report.append(f"✅ Script passed")
             if args and "--verbose" not in args:
-                # Show last few lines of output for non-verbose runs
-                lines = result.stdout.strip().split('\n')
-                print(f"   Output: ...{lines[-1] if lines else 'No output'}")
-            return True
+                # Show last line of output for non-verbose runs
+                lines = [line for line in stdout_tail if line.strip()]
+                report.append(f"   Output: ...{lines[-1] if lines else 'No output'}")
+            return True, report
         else:
-            print(f"❌ Script failed with code {result.returncode}")
-            print(f"   Error: {result.stderr.strip()}")
-            return False
+            report.append(f"❌ Script failed with code {returncode}")
+            errors = "\n".join(stderr_tail).strip()
+            report.append(f"   Error: {errors}")
+            return False, report
             
-    except subprocess.TimeoutExpired:
-        print(f"⏰ Script timed out after {timeout}s")
-        return False
     except Exception as e:
-        print(f"💥 Script crashed: {e}")
-        return False
+        report.append(f"💥 Script crashed: {e}")
+        return False, report
 
 def main():
     print("🚀 Testing YOLO Training Pipeline Example Scripts")
@@ -76,14 +109,18 @@ def main():
     passed = 0
     total = len(tests)
     
-    for i, test in enumerate(tests, 1):
-        print(f"\n[{i}/{total}] {test['description']}")
-        print("-" * 40)
+    # The scripts are separate, mostly sleeping processes, so run them all at once
+    # and print each report in order as it becomes available
+    with ThreadPoolExecutor(max_workers=total) as executor:
+        results = executor.map(lambda test: run_script_test(test["script"], test["args"]), tests)
         
-        if run_script_test(test["script"], test["args"]):
-            passed += 1
-        
-        time.sleep(1)  # Brief pause between tests
+        for i, (test, (success, report)) in enumerate(zip(tests, results), 1):
+            print(f"\n[{i}/{total}] {test['description']}")
+            print("-" * 40)
+            print("\n".join(report))
+            
+            if success:
+                passed += 1
     
     print(f"\n{'='*60}")
     print(f"🏁 Test Results: {passed}/{total} passed")
@@ -5,25 +5,67 @@ This script demonstrates model training with realistic output and progress track
 """
 
 import argparse
+import os
 import time
 import random
 import sys
 import math
 from pathlib import Path
 
+import numpy as np
+
+# SIM_FAST=1 skips the simulated processing delays (test_scripts.py sets it)
+_SLEEP_SCALE = 0.0 if os.environ.get("SIM_FAST") else 1.0
+
+def _sleep(seconds):
+    """Simulate processing time, skipped entirely in SIM_FAST mode"""
+    if _SLEEP_SCALE:
+        time.sleep(seconds * _SLEEP_SCALE)
+
+def _batch_losses_numpy(losses, jitters):
+    """Per-batch (box, cls, dfl) losses: each epoch loss plus that batch's jitter"""
+    return losses[:, None] + jitters
+
+def _batch_losses_loop(losses, jitters):
+    """Loop form of _batch_losses_numpy for numba to compile"""
+    out = np.empty_like(jitters)
+    for m in range(jitters.shape[0]):
+        for b in range(jitters.shape[1]):
+            out[m, b] = losses[m] + jitters[m, b]
+    return out
+
+compute_batch_losses = _batch_losses_numpy
+
+def enable_jit():
+    """
+    Compile the per-batch metric kernel with numba (--fast). numba is imported only here
+    since its import alone costs more than a short run saves; without it numpy is used.
+    """
+    global compute_batch_losses
+    try:
+        import numba
+    except ImportError:
+        print("⚠️  numba not installed, --fast falls back to numpy")
+        return
+    compute_batch_losses = numba.njit(cache=True, fastmath=True)(_batch_losses_loop)
+
+_RULE = "=" * 60
+_EPOCH_RULE = "=" * 20
+
 def print_banner(title):
     """Print a styled banner for script sections"""
-    print("=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
+    print(f"{_RULE}\n  {title}\n{_RULE}")
 
 def print_epoch_header(epoch, total_epochs):
     """Print epoch header with progress"""
     progress = epoch / total_epochs * 100
-    print(f"\n{'='*20} Epoch {epoch}/{total_epochs} ({progress:.1f}%) {'='*20}")
+    print(f"\n{_EPOCH_RULE} Epoch {epoch}/{total_epochs} ({progress:.1f}%) {_EPOCH_RULE}")
+
+# Per-epoch training metrics, stored as one array per metric indexed by epoch - 1
+EPOCH_METRICS = ('loss', 'box_loss', 'cls_loss', 'dfl_loss', 'lr')
 
-def simulate_epoch_training(epoch, total_epochs, verbose=False):
-    """Simulate training for one epoch with realistic metrics"""
+def simulate_epoch_training(epoch, total_epochs, lr, metrics, verbose=False):
+    """Simulate training for one epoch with realistic metrics, recording them in metrics"""
     
     # Simulate training parameters
     batch_size = 16
@@ -37,37 +79,48 @@ def simulate_epoch_training(epoch, total_epochs, verbose=False):
     cls_loss = epoch_loss * random.uniform(0.2, 0.4)
     dfl_loss = epoch_loss * random.uniform(0.1, 0.3)
     
-    # Learning rate schedule
-    base_lr = 0.01
-    lr = base_lr * (0.1 ** (epoch // (total_epochs // 3)))
-    
     print(f"Learning Rate: {lr:.6f}")
     print(f"Batch Size: {batch_size}")
     print(f"Total Batches: {total_batches}")
     
+    # Draw the per-batch noise for the whole epoch at once
+    rng = np.random.default_rng()
+    jitters = np.stack([
+        rng.uniform(-0.1, 0.1, total_batches),
+        rng.uniform(-0.05, 0.05, total_batches),
+        rng.uniform(-0.02, 0.02, total_batches)
+    ])
+    gpu_mems = rng.uniform(2.5, 7.8, total_batches)
+    instances_arr = rng.integers(15, 46, total_batches)
+    batch_losses = compute_batch_losses(np.array([box_loss, cls_loss, dfl_loss]), jitters)
+    
+    # Verbose batch lines are collected and written once per epoch
+    batch_lines = []
+    
     # Simulate batch training
     for batch in range(1, total_batches + 1):
         # Simulate batch processing
-        batch_box_loss = box_loss + random.uniform(-0.1, 0.1)
-        batch_cls_loss = cls_loss + random.uniform(-0.05, 0.05)
-        batch_dfl_loss = dfl_loss + random.uniform(-0.02, 0.02)
+        batch_box_loss, batch_cls_loss, batch_dfl_loss = batch_losses[:, batch - 1]
         
         # Simulate GPU memory usage
-        gpu_mem = random.uniform(2.5, 7.8)
+        gpu_mem = gpu_mems[batch - 1]
         
         # Simulate instances and image size
-        instances = random.randint(15, 45)
+        instances = instances_arr[batch - 1]
         img_size = 640
         
         if verbose and batch % 10 == 0:
-            print(f"  Batch {batch:3d}/{total_batches}: "
-                  f"box_loss={batch_box_loss:.3f} "
-                  f"cls_loss={batch_cls_loss:.3f} "
-                  f"dfl_loss={batch_dfl_loss:.3f} "
-                  f"GPU_mem={gpu_mem:.1f}GB")
+            batch_lines.append(f"  Batch {batch:3d}/{total_batches}: "
+                               f"box_loss={batch_box_loss:.3f} "
+                               f"cls_loss={batch_cls_loss:.3f} "
+                               f"dfl_loss={batch_dfl_loss:.3f} "
+                               f"GPU_mem={gpu_mem:.1f}GB\n")
         
         # Simulate processing time
-        time.sleep(0.05 if verbose else 0.02)
+        _sleep(0.05 if verbose else 0.02)
+    
+    if batch_lines:
+        sys.stdout.write("".join(batch_lines))
     
     # Print epoch summary with YOLO-style output
     print(f"\nEpoch {epoch:3d}/{total_epochs}: "
@@ -81,7 +134,7 @@ def simulate_epoch_training(epoch, total_epochs, verbose=False):
     # Simulate validation if it's a validation epoch
     if epoch % 5 == 0 or epoch == total_epochs:
         print(f"\n🔍 Running validation...")
-        time.sleep(1)
+        _sleep(1)
         
         # Simulate validation metrics
         precision = random.uniform(0.75, 0.95) * (1 + (epoch / total_epochs) * 0.2)
@@ -102,16 +155,14 @@ def simulate_epoch_training(epoch, total_epochs, verbose=False):
         if epoch == total_epochs or random.random() < 0.3:
             print(f"💾 Saving best model checkpoint (mAP@0.5 = {map50:.3f})")
     
-    return {
-        'epoch': epoch,
-        'loss': epoch_loss,
-        'box_loss': box_loss,
-        'cls_loss': cls_loss,
-        'dfl_loss': dfl_loss,
-        'lr': lr
-    }
+    idx = epoch - 1
+    metrics['loss'][idx] = epoch_loss
+    metrics['box_loss'][idx] = box_loss
+    metrics['cls_loss'][idx] = cls_loss
+    metrics['dfl_loss'][idx] = dfl_loss
+    metrics['lr'][idx] = lr
 
-def train_model(model_path, epochs, verbose=False):
+def train_model(model_path, epochs, verbose=False, base_lr=0.01):
     """Simulate complete model training"""
     print_banner("YOLO MODEL TRAINING")
     
@@ -122,7 +173,7 @@ def train_model(model_path, epochs, verbose=False):
     
     # Simulate model initialization
     print("🔧 Initializing training...")
-    time.sleep(1)
+    _sleep(1)
     
     print("  ✓ Loading pre-trained weights")
     print(f"  ✓ Model architecture: YOLOv8n")
@@ -143,30 +194,31 @@ def train_model(model_path, epochs, verbose=False):
     print("      Epoch   GPU_mem       box_loss   cls_loss   dfl_loss  Instances       Size")
     
     # Training loop
-    training_metrics = []
+    training_metrics = {name: np.empty(epochs, np.float32) for name in EPOCH_METRICS}
+    
+    # Step learning rate schedule: divide by 10 after each third of the epochs
+    lr_schedule = base_lr * np.float_power(0.1, np.arange(epochs) * 3 // epochs)
     
     for epoch in range(1, epochs + 1):
-        metrics = simulate_epoch_training(epoch, epochs, verbose)
-        training_metrics.append(metrics)
+        simulate_epoch_training(epoch, epochs, lr_schedule[epoch - 1], training_metrics, verbose)
         
         # Simulate time between epochs
-        time.sleep(0.5 if verbose else 0.2)
+        _sleep(0.5 if verbose else 0.2)
     
     # Training completion summary
     print(f"\n🎉 Training completed!")
     print(f"⏱️  Total training time: {epochs * random.uniform(0.8, 1.5):.1f} minutes")
     
     # Final model metrics
-    final_metrics = training_metrics[-1]
     print(f"\n📈 Final Training Metrics:")
-    print(f"  • Final Loss: {final_metrics['loss']:.4f}")
-    print(f"  • Box Loss: {final_metrics['box_loss']:.4f}")
-    print(f"  • Class Loss: {final_metrics['cls_loss']:.4f}")
-    print(f"  • DFL Loss: {final_metrics['dfl_loss']:.4f}")
+    print(f"  • Final Loss: {training_metrics['loss'][-1]:.4f}")
+    print(f"  • Box Loss: {training_metrics['box_loss'][-1]:.4f}")
+    print(f"  • Class Loss: {training_metrics['cls_loss'][-1]:.4f}")
+    print(f"  • DFL Loss: {training_metrics['dfl_loss'][-1]:.4f}")
     
     # Simulate model saving
     print(f"\n💾 Saving trained model...")
-    time.sleep(1)
+    _sleep(1)
     
     model_name = f"yolov8_custom_{epochs}epochs.pt"
     print(f"  ✓ Model saved: ./models/{model_name}")
@@ -244,6 +296,12 @@ Examples:
         help="Path to data configuration file"
     )
     
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="JIT-compile the metric computation with numba (if installed)"
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -271,8 +329,11 @@ Examples:
         if not args.model.endswith(('.pt', '.pth', '.weights')):
             print(f"⚠️  Warning: Model file '{args.model}' doesn't have expected extension")
         
+        if args.fast:
+            enable_jit()
+        
         # Run training
-        success = train_model(args.model, args.epochs, args.verbose)
+        success = train_model(args.model, args.epochs, args.verbose, args.learning_rate)
         
         if success:
             print(f"\n🎉 Training script completed successfully!")
@@ -285,7 +346,7 @@ Examples:
     except KeyboardInterrupt:
         print("\n\n⚠️  Training interrupted by user")
         print("💾 Saving checkpoint before exit...")
-        time.sleep(1)
+        _sleep(1)
         print("✅ Checkpoint saved. Training can be resumed.")
         sys.exit(130)
     except ValueError as e:
@@ -5,16 +5,25 @@ This script demonstrates data validation with realistic output.
 """
 
 import argparse
+import os
 import time
 import random
 import sys
 from pathlib import Path
 
+# SIM_FAST=1 skips the simulated processing delays (test_scripts.py sets it)
+_SLEEP_SCALE = 0.0 if os.environ.get("SIM_FAST") else 1.0
+
+def _sleep(seconds):
+    """Simulate processing time, skipped entirely in SIM_FAST mode"""
+    if _SLEEP_SCALE:
+        time.sleep(seconds * _SLEEP_SCALE)
+
+_RULE = "=" * 60
+
 def print_banner(title):
     """Print a styled banner for script sections"""
-    print("=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
+    print(f"{_RULE}\n  {title}\n{_RULE}")
 
 def validate_dataset():
     """Simulate dataset validation with realistic output"""
@@ -22,7 +31,7 @@ def validate_dataset():
     
     # Simulate checking dataset structure
     print("🔍 Checking dataset structure...")
-    time.sleep(1)
+    _sleep(1)
     
     dataset_paths = [
         "data/train/images",
@@ -31,13 +40,12 @@ def validate_dataset():
         "data/val/labels"
     ]
     
-    for path in dataset_paths:
-        print(f"  ✓ Found: {path}")
-        time.sleep(0.5)
+    print("\n".join(f"  ✓ Found: {path}" for path in dataset_paths))
+    _sleep(len(dataset_paths) * 0.5)
     
     # Simulate counting files
     print("\n📊 Analyzing dataset contents...")
-    time.sleep(1)
+    _sleep(1)
     
     train_images = random.randint(800, 1200)
     val_images = random.randint(200, 400)
@@ -48,17 +56,18 @@ def validate_dataset():
     
     # Simulate class distribution analysis
     print("\n🏷️  Class distribution analysis...")
-    time.sleep(1)
+    _sleep(1)
     
     classes = ["person", "car", "truck", "bicycle", "motorcycle"]
-    for i, cls in enumerate(classes):
-        count = random.randint(50, 300)
-        print(f"  Class {i} ({cls}): {count} instances")
-        time.sleep(0.3)
+    print("\n".join(
+        f"  Class {i} ({cls}): {random.randint(50, 300)} instances"
+        for i, cls in enumerate(classes)
+    ))
+    _sleep(len(classes) * 0.3)
     
     # Simulate image quality checks
     print("\n🖼️  Image quality validation...")
-    time.sleep(1)
+    _sleep(1)
     
     print("  ✓ Image formats: PNG, JPG (valid)")
     print("  ✓ Resolution range: 416x416 to 1920x1080")
@@ -67,7 +76,7 @@ def validate_dataset():
     
     # Simulate annotation validation
     print("\n📝 Annotation validation...")
-    time.sleep(1)
+    _sleep(1)
     
     print("  ✓ YOLO format annotations detected")
     print("  ✓ Bounding box coordinates: normalized [0,1]")
@@ -82,11 +91,11 @@ def clean_dataset():
     print_banner("DATASET CLEANING")
     
     print("🧹 Starting dataset cleanup operations...")
-    time.sleep(1)
+    _sleep(1)
     
     # Simulate removing duplicates
     print("\n🔍 Checking for duplicate images...")
-    time.sleep(2)
+    _sleep(2)
     duplicates = random.randint(0, 15)
     if duplicates > 0:
         print(f"  ⚠️  Found {duplicates} duplicate images")
@@ -96,7 +105,7 @@ def clean_dataset():
     
     # Simulate fixing annotations
     print("\n📐 Validating annotation coordinates...")
-    time.sleep(1)
+    _sleep(1)
     
     invalid_boxes = random.randint(0, 8)
     if invalid_boxes > 0:
@@ -107,7 +116,7 @@ def clean_dataset():
     
     # Simulate image preprocessing
     print("\n🎨 Optimizing image formats...")
-    time.sleep(1)
+    _sleep(1)
     
     print("  ✓ Converted BMP files to JPG")
     print("  ✓ Optimized PNG compression")
@@ -115,12 +124,11 @@ def clean_dataset():
     
     # Simulate cache cleanup
     print("\n🗂️  Cleaning cache files...")
-    time.sleep(1)
+    _sleep(1)
     
     cache_files = [".DS_Store", "Thumbs.db", "*.tmp", "*.cache"]
-    for cache_file in cache_files:
-        print(f"  🗑️  Removed: {cache_file}")
-        time.sleep(0.3)
+    print("\n".join(f"  🗑️  Removed: {cache_file}" for cache_file in cache_files))
+    _sleep(len(cache_files) * 0.3)
     
     print("\n✅ Dataset cleaning completed successfully!")
     return True
@@ -1,11 +1,47 @@
 import os
-import random
+import functools
+import multiprocessing
 import shutil
-from glob import glob
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import numpy as np
+import cv2
 import argparse
 
+def list_files(directory, extension):
+    """
+    List the paths of the files in directory ending in extension, like a glob for
+    '*' + extension but from a single scandir pass. A missing directory lists as empty.
+    """
+    if not os.path.isdir(directory):
+        return []
+    with os.scandir(directory) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.name.endswith(extension) and not entry.name.startswith('.')
+        ]
+
+def link_or_copy(src, dest_dir):
+    """
+    Hardlink src into dest_dir, which is instant since training only reads the dataset.
+    Falls back to copying when linking isn't possible (another filesystem, no hardlink
+    support, or the name is already taken there).
+    """
+    dest = os.path.join(dest_dir, os.path.basename(src))
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+def resize_image(image, size):
+    """
+    Resize a PIL image with LANCZOS, or with OpenCV's much faster INTER_AREA when
+    shrinking an RGB image (where area averaging is the better filter anyway)
+    """
+    if image.mode == 'RGB' and size[0] <= image.width and size[1] <= image.height:
+        return Image.fromarray(cv2.resize(np.asarray(image), size, interpolation=cv2.INTER_AREA))
+    return image.resize(size, Image.LANCZOS)
+
 def resize_with_aspect_ratio(image, target_size, method='pad'):
     """
     Resize image while maintaining aspect ratio.
@@ -32,13 +68,19 @@ def resize_with_aspect_ratio(image, target_size, method='pad'):
         new_height = int(original_height * scale)
         
         # Resize the image
-        resized = image.resize((new_width, new_height), Image.LANCZOS)
+        resized = resize_image(image, (new_width, new_height))
         
-        # Create a new image with target size and paste the resized image
-        final_image = Image.new('RGBA', target_size, (0, 0, 0, 255))
+        # Place the resized image centered on a black canvas of the target size
         paste_x = (target_width - new_width) // 2
         paste_y = (target_height - new_height) // 2
-        final_image.paste(resized, (paste_x, paste_y))
+        if image.mode == 'RGB':
+            # Zeroed numpy canvas with one slice copy, instead of filling a PIL image and pasting
+            canvas = np.zeros((target_height, target_width, 3), dtype=np.uint8)
+            canvas[paste_y:paste_y + new_height, paste_x:paste_x + new_width] = np.asarray(resized)
+            final_image = Image.fromarray(canvas)
+        else:
+            final_image = Image.new(image.mode, target_size, (0, 0, 0, 255) if image.mode == 'RGBA' else 0)
+            final_image.paste(resized, (paste_x, paste_y))
         
         # Return actual scale factors used
         return final_image, scale, scale
@@ -50,7 +92,7 @@ def resize_with_aspect_ratio(image, target_size, method='pad'):
         new_height = int(original_height * scale)
         
         # Resize the image
-        resized = image.resize((new_width, new_height), Image.LANCZOS)
+        resized = resize_image(image, (new_width, new_height))
         
         # Calculate crop coordinates (center crop)
         crop_x = (new_width - target_width) // 2
@@ -62,6 +104,276 @@ def resize_with_aspect_ratio(image, target_size, method='pad'):
     else:
         raise ValueError("Method must be 'pad' or 'crop'")
 
+def alpha_composite(background, cursor, x, y):
+    """
+    Blend an RGBA cursor array onto an RGB background array in place, with its
+    top-left corner at (x, y): out = cursor * alpha + background * (1 - alpha).
+    Parts of the cursor falling outside the background are clipped.
+    """
+    # Clip the cursor rectangle to the background
+    x0, y0 = max(x, 0), max(y, 0)
+    x1 = min(x + cursor.shape[1], background.shape[1])
+    y1 = min(y + cursor.shape[0], background.shape[0])
+    if x1 <= x0 or y1 <= y0:
+        return
+    
+    blend_region(background[y0:y1, x0:x1], cursor[y0 - y:y1 - y, x0 - x:x1 - x])
+
+def _blend_region_numpy(region, cursor):
+    """Blend an RGBA cursor array onto an equally sized RGB region in place"""
+    # All in uint16: fg * a + bg * (255 - a) + 128 is at most 65153, and
+    # (t + (t >> 8)) >> 8 is exactly the rounded t / 255 without a division
+    alpha = cursor[..., 3:4].astype(np.uint16)
+    t = cursor[..., :3] * alpha + region * (255 - alpha) + 128
+    region[...] = (t + (t >> 8)) >> 8
+
+def _blend_region_loop(region, cursor):
+    """Loop form of _blend_region_numpy for numba to compile, in exact integer arithmetic"""
+    for y in range(region.shape[0]):
+        for x in range(region.shape[1]):
+            a = np.int32(cursor[y, x, 3])
+            for c in range(3):
+                region[y, x, c] = (np.int32(cursor[y, x, c]) * a + np.int32(region[y, x, c]) * (255 - a) + 127) // 255
+
+blend_region = _blend_region_numpy
+
+def enable_jit():
+    """
+    Compile the cursor blend with numba (--jit). numba is imported only here since its
+    import costs more than a short run saves; without it numpy is used.
+    """
+    global blend_region
+    try:
+        import numba
+    except ImportError:
+        print("Warning: numba not installed, --jit falls back to numpy")
+        return
+    blend_region = numba.njit(cache=True, fastmath=True)(_blend_region_loop)
+
+def prepare_background(path, target_size, method):
+    """
+    Decode a background and resize it to the output size.
+    
+    Returns:
+        tuple: (rgb_array, scale, offset_x, offset_y, width, height) where a point (x, y)
+        of the original width x height background lands at
+        (x * scale + offset_x, y * scale + offset_y) in rgb_array
+    """
+    image = Image.open(path)
+    if image.mode != "RGB":  # JPEGs already decode to RGB
+        image = image.convert("RGB")
+    width, height = image.size
+    resized, scale, _ = resize_with_aspect_ratio(image, target_size, method)
+    
+    # Same integer offsets resize_with_aspect_ratio pads or crops by
+    offset_x = (target_size[0] - int(width * scale)) // 2
+    offset_y = (target_size[1] - int(height * scale)) // 2
+    if method == 'crop':
+        offset_x = -((int(width * scale) - target_size[0]) // 2)
+        offset_y = -((int(height * scale) - target_size[1]) // 2)
+    
+    return np.asarray(resized), scale, offset_x, offset_y, width, height
+
+# Per-process generation settings and decoded cursors, set up by _init_worker
+_worker = {}
+
+def _init_worker(background_files, cursor_files, img_size, resize_method, images_out_dir, use_jit):
+    """Pool initializer: store the run settings and decode every cursor once per worker"""
+    if use_jit:
+        enable_jit()
+    _worker.update(
+        background_files=background_files,
+        cursor_files=cursor_files,
+        img_size=img_size,
+        resize_method=resize_method,
+        images_out_dir=images_out_dir,
+        cursors={path: load_cursor(path) for path in cursor_files},
+        # (cursor_path, (width, height)) -> resized RGBA array, filled as sizes come up
+        resized_cursors={},
+        # Saves run here so JPEG encoding (which releases the GIL) overlaps the next composite
+        writer=ThreadPoolExecutor(max_workers=4),
+    )
+
+def load_cursor(path):
+    """Decode a cursor image as RGBA, without a convert() copy when it already is RGBA"""
+    cursor = Image.open(path)
+    if cursor.mode != "RGBA":
+        return cursor.convert("RGBA")
+    cursor.load()  # Decode now so the file is closed
+    return cursor
+
+@functools.lru_cache(maxsize=None)
+def _load_background(path):
+    """
+    Decode and resize a background the first time this worker draws it; every later
+    pick is a cache hit, and backgrounds a worker never draws are never decoded.
+    """
+    return prepare_background(path, _worker["img_size"], _worker["resize_method"])
+
+def resized_cursor(cursor_path, size):
+    """
+    Return the cursor resized to size as an RGBA array. Cursor heights and background
+    scales only take a few distinct values, so each size is resized once per worker.
+    """
+    key = (cursor_path, size)
+    resized = _worker["resized_cursors"].get(key)
+    if resized is None:
+        # PIL premultiplies alpha, which keeps transparent pixels from darkening the edges.
+        # At 20-40px, a large downscale, bilinear is indistinguishable from LANCZOS and cheaper.
+        resized = _worker["resized_cursors"][key] = np.asarray(
+            _worker["cursors"][cursor_path].resize(size, Image.BILINEAR)
+        )
+    return resized
+
+def _save_image(img_path, image):
+    """Write one synthetic image"""
+    # Fixed baseline JPEG settings; optimize=True would cost a second Huffman pass per image
+    image.save(img_path, quality=85, subsampling="4:2:0", optimize=False, progressive=False)
+
+def _generate_one(task):
+    """
+    Generate synthetic image i and its label from its pre-drawn random choices and
+    queue the image on the worker's writer threads.
+    
+    Returns:
+        tuple: (future of the image save, (x_center, y_center, width, height) of the
+        cursor box in output image pixels)
+    """
+    i, bg_idx, cursor_idx, new_cursor_h, paste_fx, paste_fy = task
+    background_files = _worker["background_files"]
+    cursor_files = _worker["cursor_files"]
+    images_out_dir = _worker["images_out_dir"]
+
+    # --- Choose random assets ---
+    bg_path = background_files[bg_idx]
+    cursor_path = cursor_files[cursor_idx]
+
+    # --- Open and process images ---
+    background, scale, offset_x, offset_y, bg_w, bg_h = _load_background(bg_path)
+    background = background.copy()
+    cursor = _worker["cursors"][cursor_path]
+
+    # --- Place the cursor in full-size background coordinates, then draw it scaled onto
+    # the already resized background, so only the cursor is resized per image ---
+
+    # 1. Define a realistic, small size for the cursor (e.g., 20-40px height)
+    # This size is relative to a typical screen, not the final 640x640 image.
+    cursor_w, cursor_h = cursor.size
+    if cursor_h > 0: # Avoid division by zero
+        aspect_ratio = cursor_w / cursor_h
+        new_cursor_w = int(new_cursor_h * aspect_ratio)
+    else:
+        new_cursor_w = 20 # Default width if height is 0
+
+    # 2. Place the small cursor on the full-size background
+    max_x = bg_w - new_cursor_w
+    max_y = bg_h - new_cursor_h
+    
+    # Ensure max_x and max_y are not negative if background is smaller than cursor
+    if max_x < 0 or max_y < 0:
+        # If the background is smaller than the cursor, we'll just place at 0,0
+        # and let the final resize handle it. This is an edge case.
+        paste_x = 0
+        paste_y = 0
+    else:
+        # Uniform in [0, max] from the pre-drawn fractions in [0, 1)
+        paste_x = int(paste_fx * (max_x + 1))
+        paste_y = int(paste_fy * (max_y + 1))
+
+    # 3. Resize the cursor by the background's scale and blend it in at the scaled position
+    scale_x = scale_y = scale
+    cursor_resized = resized_cursor(
+        cursor_path, (max(1, round(new_cursor_w * scale)), max(1, round(new_cursor_h * scale)))
+    )
+    alpha_composite(
+        background, cursor_resized,
+        round(paste_x * scale + offset_x), round(paste_y * scale + offset_y)
+    )
+    final_image_rgb = Image.fromarray(background)
+
+    # --- Calculate YOLO label based on the final resized image ---
+    # The coordinates of the pasted cursor are mapped like every other background point:
+    # scaled, then shifted by the background's cached padding (or negative crop) offset
+    final_x = paste_x * scale_x + offset_x
+    final_y = paste_y * scale_y + offset_y
+    final_w = new_cursor_w * scale_x
+    final_h = new_cursor_h * scale_y
+
+    x_center = final_x + final_w / 2
+    y_center = final_y + final_h / 2
+
+    # --- Save image (the box goes back to the parent, which normalizes and writes all labels at once) ---
+    img_filename = f"synth_cursor_{i:04d}.jpg"
+    save = _worker["writer"].submit(_save_image, os.path.join(images_out_dir, img_filename), final_image_rgb)
+    return save, (x_center, y_center, final_w, final_h)
+
+def _generate_chunk(tasks):
+    """
+    Generate a chunk of images, overlapping each save with the next composite. Waits for
+    every save before returning, so a finished chunk's images are fully on disk and at
+    most one chunk of images is held in memory per worker.
+    
+    Returns:
+        list: (image index, cursor box in pixels) for each task
+    """
+    results = [_generate_one(task) for task in tasks]
+    for save, _ in results:
+        save.result()
+    return [(task[0], box) for task, (_, box) in zip(tasks, results)]
+
+def write_labels(labels_out_dir, boxes, img_size):
+    """
+    Write a YOLO label file synth_cursor_NNNN.txt for row NNNN of boxes, an (N, 4) array
+    of (x_center, y_center, width, height) in pixels of img_size images.
+    """
+    # Normalize and clamp every box at once, so the loop below only formats and writes
+    width, height = img_size
+    boxes = np.clip(boxes / (width, height, width, height), 0, 1)
+    
+    # Raw os.open/os.write: one buffer per file, without building a Python file object
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    for i, box in enumerate(boxes.tolist()):
+        fd = os.open(os.path.join(labels_out_dir, f"synth_cursor_{i:04d}.txt"), flags, 0o644)
+        try:
+            os.write(fd, "0 {:.6f} {:.6f} {:.6f} {:.6f}".format(*box).encode())
+        finally:
+            os.close(fd)
+
+def remove_stale_outputs(output_dir, num_images):
+    """
+    Remove everything in output_dir that generating num_images images won't overwrite:
+    synthetic files beyond the new count, custom dataset files (included again afterwards)
+    and anything besides images/ and labels/. Returns the number of entries removed.
+    """
+    keep = {
+        'images': {f"synth_cursor_{i:04d}.jpg" for i in range(num_images)},
+        'labels': {f"synth_cursor_{i:04d}.txt" for i in range(num_images)},
+    }
+    stale = []
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.name not in keep or not entry.is_dir(follow_symlinks=False):
+                stale.append(entry)
+                continue
+            with os.scandir(entry.path) as files:
+                # Hardlinks are removed too, so overwriting in place can't change a linked source file
+                stale.extend(
+                    f for f in files
+                    if f.name not in keep[entry.name] or not f.is_file(follow_symlinks=False)
+                    or f.stat(follow_symlinks=False).st_nlink > 1
+                )
+    
+    def remove(entry):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+    
+    # Unlinks are I/O bound, so they run on a few threads
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(remove, stale))
+    return len(stale)
+
 def generate_data(
     backgrounds_path, 
     cursors_path, 
@@ -70,7 +382,9 @@ def generate_data(
     img_size=(640, 640),
     custom_dataset_path=None,
     resize_method='pad',
-    target_name='cursor'
+    target_name='cursor',
+    num_workers=None,
+    use_jit=False
 ):
     """
     Generates a synthetic dataset and optionally includes a custom dataset.
@@ -84,6 +398,8 @@ def generate_data(
         custom_dataset_path (str, optional): Path to a custom dataset to include. Defaults to None.
         resize_method (str): 'pad' (maintain aspect ratio with padding) or 'crop' (center crop). Default 'pad'.
         target_name (str): Name of the target object being detected. Default 'cursor'.
+        num_workers (int, optional): Worker processes generating images. Defaults to one per CPU.
+        use_jit (bool): Compile the cursor blend with numba, if installed. Default False.
     """
     print(f"--- Starting Dataset Generation ---")
     print(f"   Backgrounds: {backgrounds_path}")
@@ -99,16 +415,18 @@ def generate_data(
     images_out_dir = os.path.join(output_dir, 'images')
     labels_out_dir = os.path.join(output_dir, 'labels')
 
+    # An existing output directory is reused: synthetic files have deterministic names and
+    # are overwritten in place, so only the files this run won't rewrite are removed
     if os.path.exists(output_dir):
-        shutil.rmtree(output_dir)
-        print(f"Cleaned existing output directory: {output_dir}")
+        stale_count = remove_stale_outputs(output_dir, num_images)
+        print(f"Reusing existing output directory: {output_dir} (removed {stale_count} stale file(s))")
 
-    os.makedirs(images_out_dir)
-    os.makedirs(labels_out_dir)
+    os.makedirs(images_out_dir, exist_ok=True)
+    os.makedirs(labels_out_dir, exist_ok=True)
 
     # --- 2. Load File Lists ---
-    background_files = glob(os.path.join(backgrounds_path, '*.jpg'))
-    cursor_files = glob(os.path.join(cursors_path, '*.png'))
+    background_files = list_files(backgrounds_path, '.jpg')
+    cursor_files = list_files(cursors_path, '.png')
 
     if not background_files:
         raise FileNotFoundError(f"No background images found in {backgrounds_path}")
@@ -118,95 +436,33 @@ def generate_data(
     print(f"Found {len(background_files)} backgrounds and {len(cursor_files)} {target_name} objects.")
 
     # --- 3. Generate Synthetic Images ---
+    # Images are independent, so they are generated across all cores. All random choices
+    # are drawn here in bulk, so they don't depend on which worker generates an image:
+    # background, cursor, cursor height (20-40px) and paste position as a fraction of the
+    # free space (turned into pixels once the worker knows the sizes).
     print("\n--- Generating Synthetic Images ---")
-    for i in range(num_images):
-        # --- Choose random assets ---
-        bg_path = random.choice(background_files)
-        cursor_path = random.choice(cursor_files)
-
-        # --- Open and process images ---
-        background = Image.open(bg_path).convert("RGBA")
-        cursor = Image.open(cursor_path).convert("RGBA")
-
-        # --- New Logic: Paste small cursor on large background, then resize all at once ---
-
-        # 1. Define a realistic, small size for the cursor (e.g., 20-40px height)
-        # This size is relative to a typical screen, not the final 640x640 image.
-        new_cursor_h = random.randint(20, 40)
-        cursor_w, cursor_h = cursor.size
-        if cursor_h > 0: # Avoid division by zero
-            aspect_ratio = cursor_w / cursor_h
-            new_cursor_w = int(new_cursor_h * aspect_ratio)
-        else:
-            new_cursor_w = 20 # Default width if height is 0
-
-        # Resize the cursor to its small, realistic size
-        cursor_resized = cursor.resize((new_cursor_w, new_cursor_h), Image.LANCZOS)
-
-        # 2. Place the small cursor on the full-size background
-        bg_w, bg_h = background.size
-        max_x = bg_w - new_cursor_w
-        max_y = bg_h - new_cursor_h
-        
-        # Ensure max_x and max_y are not negative if background is smaller than cursor
-        if max_x < 0 or max_y < 0:
-            # If the background is smaller than the cursor, we'll just place at 0,0
-            # and let the final resize handle it. This is an edge case.
-            paste_x = 0
-            paste_y = 0
-        else:
-            paste_x = random.randint(0, max_x)
-            paste_y = random.randint(0, max_y)
-
-        # Paste using the alpha channel as a mask
-        background.paste(cursor_resized, (paste_x, paste_y), cursor_resized)
-
-        # 3. Resize maintaining aspect ratio with padding or cropping
-        final_image, scale_x, scale_y = resize_with_aspect_ratio(background, img_size, resize_method)
-        
-        # Convert back to RGB for saving as JPEG
-        final_image_rgb = final_image.convert("RGB")
-
-        # --- Save image ---
-        img_filename = f"synth_cursor_{i:04d}.jpg"
-        final_image_rgb.save(os.path.join(images_out_dir, img_filename))
-
-        # --- Calculate and save YOLO label based on the final resized image ---
-        # The coordinates of the pasted cursor must be scaled by the actual scale used
-        final_x = paste_x * scale_x
-        final_y = paste_y * scale_y
-        final_w = new_cursor_w * scale_x
-        final_h = new_cursor_h * scale_y
-
-        # If using 'pad' method and both scales are equal, account for padding offset
-        if resize_method == 'pad' and scale_x == scale_y:  
-            # Calculate the actual scaled dimensions and padding offsets
-            actual_scaled_w = bg_w * scale_x
-            actual_scaled_h = bg_h * scale_y
-            pad_x = (img_size[0] - actual_scaled_w) / 2
-            pad_y = (img_size[1] - actual_scaled_h) / 2
-            
-            final_x += pad_x
-            final_y += pad_y
-
-        x_center = final_x + final_w / 2
-        y_center = final_y + final_h / 2
-
-        # Ensure coordinates are within bounds
-        x_center_norm = max(0, min(1, x_center / img_size[0]))
-        y_center_norm = max(0, min(1, y_center / img_size[1]))
-        width_norm = max(0, min(1, final_w / img_size[0]))
-        height_norm = max(0, min(1, final_h / img_size[1]))
-
-        label_content = f"0 {x_center_norm:.6f} {y_center_norm:.6f} {width_norm:.6f} {height_norm:.6f}"
-        
-        label_filename = f"synth_cursor_{i:04d}.txt"
-        with open(os.path.join(labels_out_dir, label_filename), 'w') as f:
-            f.write(label_content)
-
-        if (i + 1) % 100 == 0:
-            print(f"Generated {i + 1}/{num_images} synthetic images...")
+    rng = np.random.default_rng()
+    tasks = list(zip(
+        range(num_images),
+        rng.integers(0, len(background_files), num_images).tolist(),
+        rng.integers(0, len(cursor_files), num_images).tolist(),
+        rng.integers(20, 41, num_images).tolist(),
+        rng.random(num_images).tolist(),
+        rng.random(num_images).tolist(),
+    ))
+    init_args = (background_files, cursor_files, img_size, resize_method, images_out_dir, use_jit)
+    chunks = [tasks[start:start + 16] for start in range(0, num_images, 16)]
+    boxes = np.empty((num_images, 4))
+    done = 0
+    with multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=init_args) as pool:
+        for chunk_boxes in pool.imap_unordered(_generate_chunk, chunks):
+            for i, box in chunk_boxes:
+                boxes[i] = box
+            done += len(chunk_boxes)
+            if done // 100 > (done - len(chunk_boxes)) // 100:
+                print(f"Generated {done // 100 * 100}/{num_images} synthetic images...")
     
+    write_labels(labels_out_dir, boxes, img_size)
     print(f"--- Synthetic dataset generation complete. ---")
 
     # --- 4. Include Custom Dataset ---
@@ -218,14 +474,14 @@ def generate_data(
 
         copied_images = 0
         if os.path.exists(custom_images_src):
-            for img_file in glob(os.path.join(custom_images_src, '*.jpg')):
-                shutil.copy(img_file, images_out_dir)
+            for img_file in list_files(custom_images_src, '.jpg'):
+                link_or_copy(img_file, images_out_dir)
                 copied_images += 1
         
         copied_labels = 0
         if os.path.exists(custom_labels_src):
-            for label_file in glob(os.path.join(custom_labels_src, '*.txt')):
-                shutil.copy(label_file, labels_out_dir)
+            for label_file in list_files(custom_labels_src, '.txt'):
+                link_or_copy(label_file, labels_out_dir)
                 copied_labels += 1
 
         print(f"Copied {copied_images} images and {copied_labels} labels from custom dataset.")
@@ -253,18 +509,21 @@ def sync_backgrounds(source_dir, dest_dir):
         os.makedirs(dest_dir)
         print(f"Created destination directory: {dest_dir}")
 
-    source_files = os.listdir(source_dir)
-    dest_files = os.listdir(dest_dir)
+    # One scandir pass per side; dir entries answer is_file() without an extra stat
+    dest_files = {entry.name for entry in os.scandir(dest_dir)}
+    new_files = [
+        entry.name for entry in os.scandir(source_dir)
+        if entry.name not in dest_files and entry.is_file()
+    ]
     
-    copied_count = 0
-    for filename in source_files:
-        if filename not in dest_files:
-            source_path = os.path.join(source_dir, filename)
-            dest_path = os.path.join(dest_dir, filename)
-            # Check if it's a file before copying
-            if os.path.isfile(source_path):
-                shutil.copy2(source_path, dest_path) # copy2 preserves metadata
-                copied_count += 1
+    # Copies are I/O bound, so they run on a few threads. copy2 preserves metadata and
+    # copies the data in-kernel (sendfile) on Linux.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(
+            lambda filename: shutil.copy2(os.path.join(source_dir, filename), os.path.join(dest_dir, filename)),
+            new_files
+        ))
+    copied_count = len(new_files)
     
     if copied_count > 0:
         print(f"Copied {copied_count} new background file(s) from screenshots.")
@@ -320,6 +579,17 @@ if __name__ == '__main__':
         default='cursor',
         help='Name of the target object being detected. Default is "cursor".'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes generating images. Default is one per CPU.'
+    )
+    parser.add_argument(
+        '--jit',
+        action='store_true',
+        help='Compile the cursor blend with numba (if installed).'
+    )
     args = parser.parse_args()
 
     # Handle preset sizes (maintaining 16:9-ish aspect ratio for screen content)
@@ -354,5 +624,7 @@ if __name__ == '__main__':
         img_size=img_size,
         custom_dataset_path=custom_dataset_input_path,
         resize_method=args.resize_method,
-        target_name=args.target_name
+        target_name=args.target_name,
+        num_workers=args.workers,
+        use_jit=args.jit
     )
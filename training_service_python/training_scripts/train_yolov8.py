@@ -4,174 +4,180 @@ import argparse
 import subprocess
 import sys
 import gc
+import html
+import importlib.util
+import string
 from datetime import datetime
 
+# Import name -> pip package for the training dependencies
+REQUIRED_PACKAGES = {'ultralytics': 'ultralytics', 'sklearn': 'scikit-learn', 'yaml': 'pyyaml'}
+
 def install_dependencies():
-    """Installs ultralytics and its dependencies."""
+    """Installs ultralytics and its dependencies if any of them are missing."""
     print("--> Checking/Installing dependencies (ultralytics, scikit-learn, pyyaml)...")
+    # find_spec only locates the modules, so a fully provisioned environment
+    # skips the pip subprocess (and its resolver / index round-trip) entirely
+    missing = [pkg for mod, pkg in REQUIRED_PACKAGES.items() if importlib.util.find_spec(mod) is None]
+    if not missing:
+        print("Dependencies already installed.")
+        return
     try:
-        subprocess.run([sys.executable, "-m", "pip", "install", "ultralytics", "scikit-learn", "pyyaml"], check=True)
+        subprocess.run([sys.executable, "-m", "pip", "install", "-q", "--no-input",
+                        "--disable-pip-version-check", *missing], check=True)
         print("Dependencies installed successfully.")
     except subprocess.CalledProcessError as e:
         print(f"Error: Failed to install dependencies. {e}", file=sys.stderr)
         sys.exit(1)
 
-def create_dataset_yaml(data_dir, train_dir, val_dir, target_name='cursor'):
-    """Creates the dataset.yaml file required by YOLOv8."""
+def _fast_copy(src, dst):
+    """
+    Copies src to dst without moving the bytes through Python: os.copy_file_range (an
+    in-kernel copy, or a reflink on Btrfs/XFS), falling back to shutil.copyfile. Never a
+    hardlink, since ultralytics rewrites its run files (best.pt, plots) in place.
+    """
+    if hasattr(os, 'copy_file_range'):  # Linux only
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            return
+        except OSError:
+            pass  # e.g. a kernel or filesystem without copy_file_range
+    shutil.copyfile(src, dst)
+
+def create_dataset_yaml(data_dir, train_path, val_path, target_name='cursor'):
+    """Creates the dataset.yaml file required by YOLOv8. train_path/val_path are image directories or image list files."""
     import yaml
     print("\n--> Creating dataset.yaml file...")
     
     yaml_path = os.path.join(data_dir, 'dataset.yaml')
     
     data = {
-        'train': os.path.abspath(train_dir),
-        'val': os.path.abspath(val_dir),
+        'train': os.path.abspath(train_path),
+        'val': os.path.abspath(val_path),
         'nc': 1,
         'names': [target_name]
     }
     
+    # libyaml's C emitter when PyYAML was built with it, the pure-Python one otherwise
+    dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
     with open(yaml_path, 'w') as f:
-        yaml.dump(data, f, sort_keys=False)
+        yaml.dump(data, f, Dumper=dumper, sort_keys=False)
         
     print(f"'{yaml_path}' created successfully.")
     return yaml_path
 
-def generate_html_report(html_filepath, timestamp, results_dir, epochs, batch_size, img_size, model_used, metrics, train_count=0, val_count=0):
-    """Generates an HTML report with training results and metrics."""
-    import base64
-    
-    # Try to read and encode images from results directory
-    def encode_image_to_base64(image_path):
-        try:
-            with open(image_path, 'rb') as img_file:
-                return base64.b64encode(img_file.read()).decode('utf-8')
-        except:
-            return None
-    
-    # Look for common result images
-    results_images = {}
-    potential_images = [
-        ('confusion_matrix.png', 'Confusion Matrix'),
-        ('results.png', 'Training Results'),
-        # ('train_batch0.jpg', 'Training Batch Sample'),
-        # ('val_batch0_pred.jpg', 'Validation Predictions'),
-        # ('val_batch0_labels.jpg', 'Validation Labels'),
-        ('F1_curve.png', 'F1 Curve'),
-        ('P_curve.png', 'Precision Curve'),
-        ('R_curve.png', 'Recall Curve'),
-        ('PR_curve.png', 'Precision-Recall Curve')
-    ]
-    
-    for img_file, img_title in potential_images:
-        img_path = os.path.join(results_dir, img_file)
-        if os.path.exists(img_path):
-            encoded = encode_image_to_base64(img_path)
-            if encoded:
-                results_images[img_title] = encoded
-    
-    # Generate HTML content
-    html_content = f"""<!DOCTYPE html>
+# Final validation metrics read from results.results_dict: precision, recall, mAP50, mAP50-95
+METRIC_KEYS = ('metrics/precision(B)', 'metrics/recall(B)', 'metrics/mAP50(B)', 'metrics/mAP50-95(B)')
+
+# HTML report pieces, parsed once at import. generate_html_report fills in their
+# $-placeholders (HTML-escaped where the value comes from outside) and writes them in order.
+_REPORT_HEAD = string.Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>YOLO Training Report - {timestamp}</title>
+    <title>YOLO Training Report - $timestamp</title>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 20px;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 15px;
             box-shadow: 0 20px 40px rgba(0,0,0,0.1);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #2c3e50 0%, #3498db 100%);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             margin: 0;
             font-size: 2.5em;
             font-weight: 300;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             margin-top: 10px;
             font-size: 1.1em;
             opacity: 0.9;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 30px;
-        }}
+        }
         
-        .section {{
+        .section {
             margin-bottom: 40px;
             background: #f8f9fa;
             border-radius: 10px;
             padding: 25px;
             border-left: 5px solid #3498db;
-        }}
+        }
         
-        .section h2 {{
+        .section h2 {
             margin-top: 0;
             color: #2c3e50;
             font-size: 1.8em;
             font-weight: 500;
-        }}
+        }
         
-        .config-grid {{
+        .config-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-top: 20px;
-        }}
+        }
         
-        .config-item {{
+        .config-item {
             background: white;
             padding: 15px;
             border-radius: 8px;
             border: 1px solid #e1e8ed;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .config-label {{
+        .config-label {
             font-weight: 600;
             color: #3498db;
             font-size: 0.9em;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .config-value {{
+        .config-value {
             font-size: 1.2em;
             color: #2c3e50;
             margin-top: 5px;
             word-wrap: break-word;
             overflow-wrap: break-word;
             hyphens: auto;
-        }}
+        }
         
-        .metrics-grid {{
+        .metrics-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
             gap: 20px;
             margin-top: 20px;
-        }}
+        }
         
-        .metric-card {{
+        .metric-card {
             background: white;
             padding: 20px;
             border-radius: 10px;
@@ -179,60 +185,60 @@ def generate_html_report(html_filepath, timestamp, results_dir, epochs, batch_si
             border: 1px solid #e1e8ed;
             box-shadow: 0 4px 8px rgba(0,0,0,0.1);
             transition: transform 0.2s ease;
-        }}
+        }
         
-        .metric-card:hover {{
+        .metric-card:hover {
             transform: translateY(-5px);
-        }}
+        }
         
-        .metric-name {{
+        .metric-name {
             font-size: 0.9em;
             color: #7f8c8d;
             font-weight: 600;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .metric-value {{
+        .metric-value {
             font-size: 2em;
             font-weight: 700;
             color: #2c3e50;
             margin-top: 10px;
-        }}
+        }
         
-        .images-section {{
+        .images-section {
             margin-top: 30px;
-        }}
+        }
         
-        .image-grid {{
+        .image-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 20px;
             margin-top: 20px;
-        }}
+        }
         
-        .image-card {{
+        .image-card {
             background: white;
             border-radius: 10px;
             overflow: hidden;
             box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .image-card img {{
+        .image-card img {
             width: 100%;
             height: auto;
             display: block;
-        }}
+        }
         
-        .image-title {{
+        .image-title {
             padding: 15px;
             font-weight: 600;
             color: #2c3e50;
             background: #f8f9fa;
             border-top: 1px solid #e1e8ed;
-        }}
+        }
         
-        .image-annotation {{
+        .image-annotation {
             padding: 10px 15px;
             font-size: 0.75em;
             color: #6c757d;
@@ -240,18 +246,18 @@ def generate_html_report(html_filepath, timestamp, results_dir, epochs, batch_si
             border-top: 1px solid #e9ecef;
             line-height: 1.4;
             font-style: italic;
-        }}
+        }
         
-        .timestamp {{
+        .timestamp {
             text-align: center;
             color: #7f8c8d;
             font-size: 0.9em;
             margin-top: 30px;
             padding-top: 20px;
             border-top: 1px solid #e1e8ed;
-        }}
+        }
         
-        .no-images {{
+        .no-images {
             text-align: center;
             color: #7f8c8d;
             font-style: italic;
@@ -259,7 +265,7 @@ def generate_html_report(html_filepath, timestamp, results_dir, epochs, batch_si
             background: white;
             border-radius: 10px;
             border: 2px dashed #e1e8ed;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -275,71 +281,207 @@ def generate_html_report(html_filepath, timestamp, results_dir, epochs, batch_si
                 <div class="config-grid">
                     <div class="config-item">
                         <div class="config-label">Epochs</div>
-                        <div class="config-value">{epochs}</div>
+                        <div class="config-value">$epochs</div>
                     </div>
                     <div class="config-item">
                         <div class="config-label">Batch Size</div>
-                        <div class="config-value">{batch_size}</div>
+                        <div class="config-value">$batch_size</div>
                     </div>
                     <div class="config-item">
                         <div class="config-label">Image Size</div>
-                        <div class="config-value">{img_size if isinstance(img_size, str) else (f"{img_size[0]}×{img_size[1]}" if isinstance(img_size, tuple) else f"{img_size}×{img_size}")}</div>
+                        <div class="config-value">$img_size</div>
                     </div>
                     <div class="config-item">
                         <div class="config-label">Base Model</div>
-                        <div class="config-value">{os.path.basename(model_used)}</div>
+                        <div class="config-value">$model_name</div>
                     </div>
                     <div class="config-item">
                         <div class="config-label">Training Images</div>
-                        <div class="config-value">{train_count:,}</div>
+                        <div class="config-value">$train_count</div>
                     </div>
                     <div class="config-item">
                         <div class="config-label">Validation Images</div>
-                        <div class="config-value">{val_count:,}</div>
-                    </div>"""
-        
-    html_content += """
-                    </div>
-                </div>"""
-    
-    # Add metrics section if available
-    if metrics:
-        precision = metrics.get('metrics/precision(B)', 0.0)
-        recall = metrics.get('metrics/recall(B)', 0.0)
-        map50 = metrics.get('metrics/mAP50(B)', 0.0)
-        map50_95 = metrics.get('metrics/mAP50-95(B)', 0.0)
-        
-        html_content += f"""
+                        <div class="config-value">$val_count</div>
+                    </div>""")
+
+_REPORT_METRICS = string.Template("""
             <div class="section">
                 <h2>📊 Performance Metrics</h2>
                 <div class="metrics-grid">
                     <div class="metric-card">
                         <div class="metric-name">Precision</div>
-                        <div class="metric-value">{precision:.3f}</div>
+                        <div class="metric-value">$precision</div>
                     </div>
                     <div class="metric-card">
                         <div class="metric-name">Recall</div>
-                        <div class="metric-value">{recall:.3f}</div>
+                        <div class="metric-value">$recall</div>
                     </div>
                     <div class="metric-card">
                         <div class="metric-name">mAP@50</div>
-                        <div class="metric-value">{map50:.3f}</div>
+                        <div class="metric-value">$map50</div>
                     </div>
                     <div class="metric-card">
                         <div class="metric-name">mAP@50-95</div>
-                        <div class="metric-value">{map50_95:.3f}</div>
+                        <div class="metric-value">$map50_95</div>
                     </div>
                 </div>
-            </div>"""
+            </div>""")
+
+_REPORT_IMAGE_CARD = string.Template("""
+                    <div class="image-card">
+                        <img src="$src" alt="$title">
+                        <div class="image-title">$title</div>$annotation
+                    </div>""")
+
+_REPORT_TAIL = string.Template("""
+            </div>
+            
+            <div class="timestamp">
+                Report generated on $generated_at
+            </div>
+        </div>
+    </div>
+</body>
+</html>""")
+
+def resolve_cache(cache, num_images, img_size):
+    """
+    Resolve --cache to the model.train(cache=...) value. 'auto' caches decoded images in
+    RAM when they fit in half the available memory, and on disk (as .npy files) otherwise.
+    """
+    if cache == 'none':
+        return False
+    if cache != 'auto':
+        return cache
+    import psutil
+    width, height = img_size if isinstance(img_size, tuple) else (img_size, img_size)
+    needed = num_images * width * height * 3  # Decoded, resized uint8 images
+    return 'ram' if needed < psutil.virtual_memory().available * 0.5 else 'disk'
+
+def resolve_device(device, amp):
+    """
+    Resolve --device and --amp to model.train(device=..., amp=...) values. 'auto' trains
+    on the first CUDA GPU when there is one, with mixed precision on GPUs only.
+    """
+    import torch
+    if device == 'auto':
+        device = 0 if torch.cuda.is_available() else 'cpu'
+    if amp == 'auto':
+        amp = device != 'cpu'
+    else:
+        amp = amp == 'on'
+    if device == 'cpu':
+        torch.set_num_threads(os.cpu_count() or 1)
+    return device, amp
+
+def _format_img_size(img_size):
+    """Formats an image size (int, (width, height) tuple or preformatted string) for reports."""
+    if isinstance(img_size, str):
+        return img_size
+    if isinstance(img_size, tuple):
+        return f"{img_size[0]}×{img_size[1]}"
+    return f"{img_size}×{img_size}"
+
+def generate_html_report(html_filepath, timestamp, results_dir, epochs, batch_size, img_size, model_used, metrics, train_count=0, val_count=0, embed_images=False):
+    """
+    Generates an HTML report with training results and metrics.
     
-    # Add images section
-    html_content += """
-            <div class="section">
-                <h2>📈 Training Results & Visualizations</h2>"""
+    Result images are copied into a {report name}_images/ directory next to
+    the report and referenced by relative path; embed_images inlines them as base64
+    instead, for a single-file report.
+    """
+    import base64
+    
+    # Try to read and encode images from results directory
+    def encode_image_to_base64(image_path):
+        try:
+            with open(image_path, 'rb') as img_file:
+                return base64.b64encode(img_file.read()).decode('utf-8')
+        except OSError:
+            return None
+    
+    images_dir = os.path.splitext(html_filepath)[0] + '_images'
+    
+    # Copy an image next to the report, returning its path relative to the report
+    def copy_image(image_path):
+        try:
+            os.makedirs(images_dir, exist_ok=True)
+            _fast_copy(image_path, os.path.join(images_dir, os.path.basename(image_path)))
+        except OSError:
+            return None
+        return f"{os.path.basename(images_dir)}/{os.path.basename(image_path)}"
+    
+    def image_src(image_path):
+        if embed_images:
+            encoded = encode_image_to_base64(image_path)
+            return f"data:image/png;base64,{encoded}" if encoded else None
+        return copy_image(image_path)
+    
+    # Look for common result images
+    results_images = {}
+    potential_images = [
+        ('confusion_matrix.png', 'Confusion Matrix'),
+        ('results.png', 'Training Results'),
+        # ('train_batch0.jpg', 'Training Batch Sample'),
+        # ('val_batch0_pred.jpg', 'Validation Predictions'),
+        # ('val_batch0_labels.jpg', 'Validation Labels'),
+        ('F1_curve.png', 'F1 Curve'),
+        ('P_curve.png', 'Precision Curve'),
+        ('R_curve.png', 'Recall Curve'),
+        ('PR_curve.png', 'Precision-Recall Curve')
+    ]
+    
+    # One directory listing instead of an exists() check per candidate
+    try:
+        with os.scandir(results_dir) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        present = set()
+    for img_file, img_title in potential_images:
+        if img_file in present:
+            results_images[img_title] = os.path.join(results_dir, img_file)
     
-    if results_images:
-        html_content += '<div class="image-grid">'
-        for title, encoded_img in results_images.items():
+    # Write the HTML piece by piece straight to the file, so the whole report is never
+    # held in memory
+    with open(html_filepath, 'w', encoding='utf-8') as f:
+        f.write(_REPORT_HEAD.substitute(
+            timestamp=html.escape(timestamp),
+            epochs=epochs,
+            batch_size=batch_size,
+            img_size=_format_img_size(img_size),
+            model_name=html.escape(os.path.basename(model_used)),
+            train_count=f"{train_count:,}",
+            val_count=f"{val_count:,}"
+        ))
+            
+        f.write("""
+                    </div>
+                </div>""")
+        
+        # Add metrics section if available
+        if metrics:
+            precision, recall, map50, map50_95 = (metrics.get(k, 0.0) for k in METRIC_KEYS)
+            
+            f.write(_REPORT_METRICS.substitute(
+                precision=f"{precision:.3f}", recall=f"{recall:.3f}", map50=f"{map50:.3f}", map50_95=f"{map50_95:.3f}"
+            ))
+        
+        # Add images section
+        f.write("""
+            <div class="section">
+                <h2>📈 Training Results & Visualizations</h2>""")
+        
+        # Each image is copied or encoded only when its card is written, so one encoded image
+        # at most is in memory. Unreadable images are skipped, and the grid is opened with
+        # the first readable one.
+        images_written = 0
+        for title, img_path in results_images.items():
+            src = image_src(img_path)
+            if not src:
+                continue
+            if not images_written:
+                f.write('<div class="image-grid">')
+            images_written += 1
             # Add specific annotations for key visualizations
             annotation = ""
             if title == "Confusion Matrix":
@@ -347,35 +489,21 @@ def generate_html_report(html_filepath, timestamp, results_dir, epochs, batch_si
             elif title == "Training Results":
                 annotation = '<div class="image-annotation">Training progress over epochs: Loss curves should decrease and stabilize. Precision/Recall/mAP should increase. Train and validation curves close together indicates good generalization without overfitting. Smooth curves suggest proper learning rate.</div>'
             
-            html_content += f"""
-                    <div class="image-card">
-                        <img src="data:image/png;base64,{encoded_img}" alt="{title}">
-                        <div class="image-title">{title}</div>{annotation}
-                    </div>"""
-        html_content += '</div>'
-    else:
-        html_content += '''
+            f.write(_REPORT_IMAGE_CARD.substitute(
+                src=html.escape(src), title=html.escape(title), annotation=annotation
+            ))
+        if images_written:
+            f.write('</div>')
+        else:
+            f.write('''
                 <div class="no-images">
                     No training result images found in the results directory.<br>
                     Check the training output directory for manual review.
-                </div>'''
-    
-    html_content += f"""
-            </div>
-            
-            <div class="timestamp">
-                Report generated on {datetime.now().strftime('%Y-%m-%d at %H:%M:%S')}
-            </div>
-        </div>
-    </div>
-</body>
-</html>"""
-    
-    # Write HTML file
-    with open(html_filepath, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+                </div>''')
+        
+        f.write(_REPORT_TAIL.substitute(generated_at=datetime.now().strftime('%Y-%m-%d at %H:%M:%S')))
 
-def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, project_name, model_name, model_to_use, target_name='cursor'):
+def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, project_name, model_name, model_to_use, target_name='cursor', train_count=0, val_count=0, embed_images=False, cache=False, device='auto', amp='auto'):
     """Executes the YOLOv8 training process."""
     print("\n--- Starting YOLOv8 Training ---")
     print(f"   Data config: {data_yaml_path}")
@@ -383,6 +511,7 @@ def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, proje
     print(f"   Batch size: {batch_size}")
     print(f"   Image size: {img_size}")
     print(f"   Model: {model_to_use}")
+    print(f"   Image cache: {cache or 'none'}")
     print("---------------------------------\n")
 
     try:
@@ -397,6 +526,8 @@ def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, proje
             print("Please check the path provided via the --model argument.", file=sys.stderr)
             sys.exit(1)
         
+        device, amp = resolve_device(device, amp)
+        print(f"--> Training on device: {device} (AMP {'on' if amp else 'off'})")
         print(f"--> Using model for training: {model_path}")
         # Load the model
         model = YOLO(model_path)
@@ -410,10 +541,10 @@ def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, proje
             project=project_name,
             name=model_name,
             exist_ok=True, # Allow overwriting existing project/name
-            workers=2,     # Reduce data loading workers to save memory
-            device='cpu',  # Force CPU training for better memory management
-            cache=False,   # Disable caching to save memory
-            amp=False,     # Disable automatic mixed precision to avoid CUDA issues
+            workers=min(8, os.cpu_count() or 2),
+            device=device, # First CUDA GPU if available, else CPU (--device)
+            cache=cache,   # Decode each image once instead of every epoch ('ram'/'disk'), or False
+            amp=amp,       # Mixed precision on GPU only by default (--amp)
             verbose=True,  # Keep verbose output for debugging
             save_period=10 # Save checkpoints every 10 epochs to prevent data loss
         )
@@ -421,55 +552,19 @@ def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, proje
         print("\n--- Training completed successfully! ---")
         print(f"Your trained model and results are in the '{results.save_dir}' directory.")
         
-        # Extract dataset information - use known paths since we created the dataset in this script
-        dataset_train_count = 0
-        dataset_val_count = 0
-        
-        # Use the paths we know from our dataset creation
-        script_dir = os.path.dirname(__file__)
-        known_train_dir = os.path.join(script_dir, 'data', 'yolo_dataset', 'images', 'train')
-        known_val_dir = os.path.join(script_dir, 'data', 'yolo_dataset', 'images', 'val')
+        # Final validation metrics, read once for the console, model info and HTML report
+        metrics = getattr(results, 'results_dict', None)
+        if metrics:
+            precision, recall, map50, map50_95 = (metrics.get(k, 0.0) for k in METRIC_KEYS)
         
-        print(f"Debug: Using known dataset paths:")
-        print(f"Debug: Train dir: {known_train_dir}")
-        print(f"Debug: Val dir: {known_val_dir}")
-        
-        try:
-            # Count images in train directory
-            if os.path.exists(known_train_dir):
-                train_files = [f for f in os.listdir(known_train_dir) if f.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'))]
-                dataset_train_count = len(train_files)
-                print(f"Debug: Found {dataset_train_count} training images in {known_train_dir}")
-            else:
-                print(f"Debug: Training directory does not exist: {known_train_dir}")
-            
-            # Count images in val directory
-            if os.path.exists(known_val_dir):
-                val_files = [f for f in os.listdir(known_val_dir) if f.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'))]
-                dataset_val_count = len(val_files)
-                print(f"Debug: Found {dataset_val_count} validation images in {known_val_dir}")
-            else:
-                print(f"Debug: Validation directory does not exist: {known_val_dir}")
-            
-            print(f"Dataset info extracted: {dataset_train_count} train, {dataset_val_count} val images")
-            
-        except Exception as e:
-            print(f"Warning: Could not count dataset images: {e}")
-            print("Dataset counts will remain at 0 in reports - check dataset directory manually")
-            # Don't use hardcoded fallback values - let them remain 0 if counting fails
+        # Dataset sizes come from the split made in main
+        dataset_train_count = train_count
+        dataset_val_count = val_count
+        print(f"Dataset info: {dataset_train_count} train, {dataset_val_count} val images")
         
         # Extract and display training metrics
         try:
-            # Get the best metrics from the training results
-            metrics = results.results_dict if hasattr(results, 'results_dict') else None
-            
             if metrics:
-                # Extract key metrics (these are the final validation metrics)
-                precision = metrics.get('metrics/precision(B)', 0.0)
-                recall = metrics.get('metrics/recall(B)', 0.0) 
-                map50 = metrics.get('metrics/mAP50(B)', 0.0)
-                map50_95 = metrics.get('metrics/mAP50-95(B)', 0.0)
-                
                 print("\n--- Final Training Metrics ---")
                 print(f"Precision (P):    {precision:.3f}")
                 print(f"Recall (R):       {recall:.3f}")
@@ -513,7 +608,6 @@ def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, proje
         print("\n--> Using training results for model validation metrics...")
         
         # --- Save the model and validation info ---
-        script_dir = os.path.dirname(__file__)
         target_model_dir = os.path.join(script_dir, '..', 'models')
         os.makedirs(target_model_dir, exist_ok=True)
         
@@ -527,31 +621,22 @@ def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, proje
         model_info += f"Training Configuration:\n"
         model_info += f"  Epochs: {epochs}\n"
         model_info += f"  Batch Size: {batch_size}\n"
-        model_info += f"  Image Size: {img_size if isinstance(img_size, str) else (f'{img_size[0]}×{img_size[1]}' if isinstance(img_size, tuple) else f'{img_size}×{img_size}')}\n"
+        model_info += f"  Image Size: {_format_img_size(img_size)}\n"
         model_info += f"  Base Model: {model_to_use}\n"
         if dataset_train_count > 0:
             model_info += f"  Training Images: {dataset_train_count}\n"
             model_info += f"  Validation Images: {dataset_val_count}\n"
         model_info += "\n"
         
-        # Add training metrics if available
-        try:
-            metrics = results.results_dict if hasattr(results, 'results_dict') else None
-            if metrics:
-                precision = metrics.get('metrics/precision(B)', 0.0)
-                recall = metrics.get('metrics/recall(B)', 0.0)
-                map50 = metrics.get('metrics/mAP50(B)', 0.0)
-                map50_95 = metrics.get('metrics/mAP50-95(B)', 0.0)
-                
-                model_info += f"Final Training Metrics:\n"
-                model_info += f"  Precision (P):    {precision:.3f}\n"
-                model_info += f"  Recall (R):       {recall:.3f}\n"
-                model_info += f"  mAP50:            {map50:.3f}\n"
-                model_info += f"  mAP50-95:         {map50_95:.3f}\n\n"
-            else:
-                model_info += "Training Metrics: Not available in results object\n\n"
-        except Exception as e:
-            model_info += f"Training Metrics: Error extracting metrics - {e}\n\n"
+        # Add training metrics if available (unpacked once after training)
+        if metrics:
+            model_info += f"Final Training Metrics:\n"
+            model_info += f"  Precision (P):    {precision:.3f}\n"
+            model_info += f"  Recall (R):       {recall:.3f}\n"
+            model_info += f"  mAP50:            {map50:.3f}\n"
+            model_info += f"  mAP50-95:         {map50_95:.3f}\n\n"
+        else:
+            model_info += "Training Metrics: Not available in results object\n\n"
         
         # Save the complete model info
         # Use consistent naming: {target_name}_model_{timestamp}.txt to match {target_name}_model_{timestamp}.pt
@@ -564,7 +649,7 @@ def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, proje
         # Save the model
         final_model_name = f'{target_name}_model_{timestamp}.pt'
         final_model_path = os.path.join(target_model_dir, final_model_name)
-        shutil.copy(best_model_path, final_model_path)
+        _fast_copy(best_model_path, final_model_path)
         print(f"Best model copied to: {final_model_path}")
 
         # Generate and save HTML report
@@ -578,9 +663,10 @@ def run_training(script_dir, data_yaml_path, epochs, batch_size, img_size, proje
             batch_size, 
             img_size, 
             model_to_use,
-            metrics if 'metrics' in locals() and metrics else None,
+            metrics or None,
             dataset_train_count,
-            dataset_val_count
+            dataset_val_count,
+            embed_images
         )
         print(f"HTML report saved to: {html_report_path}")
 
@@ -604,7 +690,6 @@ def main(args):
 
     # It's important to import these after the installation step
     from sklearn.model_selection import train_test_split
-    from glob import glob
 
     # --- 2. Define Paths ---
     script_dir = os.path.dirname(__file__)
@@ -616,56 +701,43 @@ def main(args):
         sys.exit(1)
 
     final_data_dir = os.path.join(script_dir, 'data', 'yolo_dataset')
-    train_img_dir = os.path.join(final_data_dir, 'images', 'train')
-    val_img_dir = os.path.join(final_data_dir, 'images', 'val')
-    train_lbl_dir = os.path.join(final_data_dir, 'labels', 'train')
-    val_lbl_dir = os.path.join(final_data_dir, 'labels', 'val')
+    train_list_path = os.path.join(final_data_dir, 'train.txt')
+    val_list_path = os.path.join(final_data_dir, 'val.txt')
 
     # --- 3. Clean up previous dataset ---
     if os.path.exists(final_data_dir):
         print(f"--> Cleaning up existing dataset directory: '{final_data_dir}'")
         shutil.rmtree(final_data_dir)
+    os.makedirs(final_data_dir)
 
-    # --- 4. Create new directories ---
-    print("--> Creating new YOLO dataset directories...")
-    os.makedirs(train_img_dir)
-    os.makedirs(val_img_dir)
-    os.makedirs(train_lbl_dir)
-    os.makedirs(val_lbl_dir)
-
-    # --- 5. Split data and move files ---
+    # --- 4. Split data into image lists ---
+    # YOLO reads the split from train.txt / val.txt (one image path per line) and
+    # finds each label by swapping images/ for labels/ in the path, so the source
+    # dataset is used in place instead of being copied into per-split directories.
+    # An image without a label is kept as a background-only example.
     print("--> Splitting data into training and validation sets...")
-    image_files = sorted(glob(os.path.join(source_dataset_dir, 'images', '*.jpg')))
-    label_files = sorted(glob(os.path.join(source_dataset_dir, 'labels', '*.txt')))
+    source_img_dir = os.path.join(source_dataset_dir, 'images')
+    image_files = []
+    if os.path.isdir(source_img_dir):
+        with os.scandir(source_img_dir) as entries:
+            image_files = sorted(os.path.abspath(entry.path) for entry in entries if entry.name.endswith('.jpg'))
 
     if not image_files:
-        print(f"Error: No images found in '{os.path.join(source_dataset_dir, 'images')}'", file=sys.stderr)
+        print(f"Error: No images found in '{source_img_dir}'", file=sys.stderr)
         sys.exit(1)
 
-    # Split the data
-    train_imgs, val_imgs, train_lbls, val_lbls = train_test_split(
-        image_files, label_files, test_size=0.2, random_state=42
-    )
-
-    # Function to copy files
-    def copy_files(files, dest_dir):
-        for f in files:
-            shutil.copy(f, dest_dir)
-
-    # Copy files to their new homes
-    print(f"Copying {len(train_imgs)} images to the training set...")
-    copy_files(train_imgs, train_img_dir)
-    copy_files(val_imgs, val_img_dir)
-    copy_files(train_lbls, train_lbl_dir)
-    copy_files(val_lbls, val_lbl_dir)
+    train_imgs, val_imgs = train_test_split(image_files, test_size=0.2, random_state=42)
+    for list_path, files in ((train_list_path, train_imgs), (val_list_path, val_imgs)):
+        with open(list_path, 'w') as f:
+            f.write('\n'.join(files) + '\n')
 
     print(f"   Training set: {len(train_imgs)} images")
     print(f"   Validation set: {len(val_imgs)} images")
 
-    # --- 6. Create dataset.yaml ---
-    yaml_path = create_dataset_yaml(final_data_dir, train_img_dir, val_img_dir, args.target_name)
+    # --- 5. Create dataset.yaml ---
+    yaml_path = create_dataset_yaml(final_data_dir, train_list_path, val_list_path, args.target_name)
 
-    # --- 7. Run Training ---
+    # --- 6. Run Training ---
     run_training(
         script_dir=script_dir,
         data_yaml_path=yaml_path,
@@ -675,13 +747,19 @@ def main(args):
         project_name='runs/train',
         model_name=f'{args.target_name}_yolov8',
         model_to_use=args.model,
-        target_name=args.target_name
+        target_name=args.target_name,
+        train_count=len(train_imgs),
+        val_count=len(val_imgs),
+        embed_images=args.embed_images,
+        cache=resolve_cache(args.cache, len(image_files), args.img_size),
+        device=args.device,
+        amp=args.amp
     )
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="YOLOv8 Training Script")
     parser.add_argument('--epochs', type=int, default=100, help='Number of training epochs.')
-    parser.add_argument('--batch-size', type=int, default=16, help='Batch size for training.')
+    parser.add_argument('--batch-size', type=int, default=16, help='Batch size for training (default: 16). Use -1 for AutoBatch, sized to the available GPU memory.')
     parser.add_argument('--img-size', type=int, default=640, help='Image size for training (square). Use --width/--height for non-square.')
     parser.add_argument('--width', type=int, default=None, help='Image width for training (overrides --img-size).')
     parser.add_argument('--height', type=int, default=None, help='Image height for training (overrides --img-size).')
@@ -689,6 +767,10 @@ if __name__ == '__main__':
     parser.add_argument('--skip-install', action='store_true', help='Skip the dependency installation step.')
     parser.add_argument('--model', type=str, default='yolov8n.pt', help='Model to use for training (e.g., "yolov8n.pt" or a path to a custom model).')
     parser.add_argument('--target-name', type=str, default='cursor', help='Name of the target object being detected. Default is "cursor".')
+    parser.add_argument('--cache', type=str, choices=['auto', 'ram', 'disk', 'none'], default='auto', help='Cache decoded training images: in RAM, on disk, none, or auto (RAM if they fit in half the available memory, otherwise disk). Default is "auto".')
+    parser.add_argument('--device', type=str, default='auto', help='Training device: "auto" (first CUDA GPU if available, else CPU), "cpu", or a CUDA device such as "0" or "0,1". Default is "auto".')
+    parser.add_argument('--amp', type=str, choices=['auto', 'on', 'off'], default='auto', help='Automatic mixed precision: "auto" enables it on GPU only. Default is "auto".')
+    parser.add_argument('--embed-images', action='store_true', help='Embed result images in the HTML report as base64 (single-file report) instead of linking them from a {report}_images/ directory.')
     
     args = parser.parse_args()
     
@@ -714,18 +796,9 @@ if __name__ == '__main__':
     # Update args for backward compatibility
     args.img_size = (img_width, img_height) if img_width != img_height else img_width
     
-    # Auto-adjust batch size based on image size to prevent OOM
-    if args.batch_size == 0:  # Only auto-adjust if using default batch size
-        img_pixels = img_width * img_height
-        if img_pixels > 800000:  # > 1024x640 or equivalent
-            args.batch_size = 2
-            print(f"Auto-adjusting batch size to {args.batch_size} for very large images ({img_width}×{img_height})")
-        elif img_pixels > 400000:  # > 832x512 or equivalent (yolo-m)
-            args.batch_size = 4
-            print(f"Auto-adjusting batch size to {args.batch_size} for large images ({img_width}×{img_height})")
-        elif img_pixels > 250000:  # > 640x384 or equivalent (yolo-s)
-            args.batch_size = 8
-            print(f"Auto-adjusting batch size to {args.batch_size} for medium images ({img_width}×{img_height})")
-        # Keep default 16 for smaller images
+    # -1 is passed through to model.train(batch=-1): Ultralytics AutoBatch measures the free
+    # GPU memory and picks the largest batch that fits (CPU training falls back to 16)
+    if args.batch_size == -1:
+        print(f"Using AutoBatch to choose the batch size for {img_width}×{img_height} images")
     
     main(args)